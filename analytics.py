@@ -0,0 +1,265 @@
+"""
+Analytics engine - trading metrics computed in a single pass over compact
+trade records, shared by the web dashboard and bot commands
+"""
+from collections import namedtuple
+from typing import Iterable, List, Dict
+
+
+# Only the fields the metrics need - no prices or notes
+TradeRecord = namedtuple(
+    'TradeRecord',
+    ['trade_id', 'account_id', 'pair', 'session', 'status', 'result', 'exit_datetime']
+)
+
+COUNTERS = ('trade_count', 'open_count', 'closed_count', 'wins', 'losses', 'break_even')
+
+
+def new_counters() -> Dict:
+    """Zeroed per-group counters (same columns as the user_stats rollup)."""
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def record_from_row(row: Dict) -> TradeRecord:
+    """
+    Build a TradeRecord from a database row, ignoring columns it doesn't need.
+
+    Args:
+        row: Dictionary cursor row
+
+    Returns:
+        TradeRecord with missing fields set to None
+    """
+    return TradeRecord(*(row.get(field) for field in TradeRecord._fields))
+
+
+def _empty_group() -> Dict:
+    """Blank wins/losses bucket used for pair and session stats."""
+    return {
+        'total': 0,
+        'wins': 0,
+        'losses': 0,
+        'win_rate': 0
+    }
+
+
+def summarize_groups(groups: List[Dict], accounts: List[Dict]) -> Dict:
+    """
+    Fold rollup rows into overall, pair, session and account stats.
+
+    Args:
+        groups: user_stats rows or group rows from compute_metrics
+        accounts: User's account rows (account_id, account_name, is_default)
+
+    Returns:
+        Dictionary with totals, pair_stats, session_stats and account_stats
+    """
+    totals = new_counters()
+    pair_stats = {}
+    session_stats = {}
+    per_account = {}
+
+    for group in groups:
+        acc = per_account.setdefault(group['account_id'], new_counters())
+        for counter in COUNTERS:
+            totals[counter] += group[counter]
+            acc[counter] += group[counter]
+
+        for stats, key in ((pair_stats, group['pair']), (session_stats, group['session'] or 'Unknown')):
+            if key not in stats:
+                stats[key] = _empty_group()
+            stats[key]['total'] += group['trade_count']
+            stats[key]['wins'] += group['wins']
+            stats[key]['losses'] += group['losses']
+
+    for stats in (pair_stats, session_stats):
+        for entry in stats.values():
+            closed = entry['wins'] + entry['losses']
+            if closed > 0:
+                entry['win_rate'] = (entry['wins'] / closed * 100)
+
+    account_stats = {}
+    for account in accounts:
+        acc_id = account['account_id']
+        acc = per_account.get(acc_id, new_counters())
+        account_stats[acc_id] = {
+            'account_name': account['account_name'],
+            'is_default': account['is_default'],
+            'total_trades': acc['trade_count'],
+            'closed_trades': acc['closed_count'],
+            'open_trades': acc['open_count'],
+            'wins': acc['wins'],
+            'losses': acc['losses'],
+            'break_even': acc['break_even'],
+            'win_rate': (acc['wins'] / acc['closed_count'] * 100) if acc['closed_count'] else 0
+        }
+
+    return {
+        'totals': totals,
+        'pair_stats': pair_stats,
+        'session_stats': session_stats,
+        'account_stats': account_stats
+    }
+
+
+def build_equity_curve(closed_sequence: List[Dict]) -> Dict:
+    """
+    Build the cumulative equity curve and win/loss streaks.
+
+    Args:
+        closed_sequence: Closed TradeRecords sorted by exit time (oldest first)
+
+    Returns:
+        Dictionary with equity_curve, max_win_streak and max_loss_streak
+    """
+    equity_curve = []
+    cumulative_pnl = 0
+    current_streak = 0
+    current_streak_type = None
+    max_win_streak = 0
+    max_loss_streak = 0
+
+    for trade in closed_sequence:
+        # Simplified P&L: +1 win, -1 loss, 0 break-even
+        pnl = 0
+        if trade.result == 'W':
+            pnl = 1
+        elif trade.result == 'L':
+            pnl = -1
+
+        cumulative_pnl += pnl
+        equity_curve.append({
+            'date': trade.exit_datetime.strftime('%Y-%m-%d'),
+            'timestamp': trade.exit_datetime.isoformat(),
+            'pnl': pnl,
+            'cumulative': cumulative_pnl,
+            'trade_id': trade.trade_id
+        })
+
+        if trade.result in ('W', 'L'):
+            if current_streak_type == trade.result:
+                current_streak += 1
+            else:
+                current_streak = 1
+                current_streak_type = trade.result
+            if current_streak_type == 'W':
+                max_win_streak = max(max_win_streak, current_streak)
+            else:
+                max_loss_streak = max(max_loss_streak, current_streak)
+        else:  # Break-even resets streak
+            current_streak = 0
+            current_streak_type = None
+
+    return {
+        'equity_curve': equity_curve,
+        'max_win_streak': max_win_streak,
+        'max_loss_streak': max_loss_streak
+    }
+
+
+def build_overview(totals: Dict, streaks: Dict) -> Dict:
+    """
+    Build the top-level 'stats' block of the dashboard payload.
+
+    Args:
+        totals: 'totals' from summarize_groups
+        streaks: Result of build_equity_curve
+
+    Returns:
+        Dashboard stats dictionary
+    """
+    wins = totals['wins']
+    losses = totals['losses']
+    closed = totals['closed_count']
+    win_rate = (wins / closed * 100) if closed else 0
+
+    # Profit factor and expectancy on the simplified ±1 P&L model
+    avg_win = wins / wins if wins > 0 else 0
+    avg_loss = losses / losses if losses > 0 else 0
+    profit_factor = (wins / losses) if losses > 0 else float('inf')
+    expectancy = (avg_win * win_rate / 100) - (avg_loss * (100 - win_rate) / 100) if closed else 0
+
+    return {
+        'total_trades': totals['trade_count'],
+        'open_trades': totals['open_count'],
+        'closed_trades': closed,
+        'wins': wins,
+        'losses': losses,
+        'break_even': totals['break_even'],
+        'win_rate': round(win_rate, 2),
+        'max_win_streak': streaks['max_win_streak'],
+        'max_loss_streak': streaks['max_loss_streak'],
+        'profit_factor': round(profit_factor, 2) if profit_factor != float('inf') else 'N/A',
+        'expectancy': round(expectancy, 2)
+    }
+
+
+def compute_metrics(records: Iterable[TradeRecord], accounts: List[Dict]) -> Dict:
+    """
+    Compute every metric with one pass over the records plus one sort.
+
+    The pass counts trades into (account, pair, session) groups and collects
+    closed trades; the closed trades are then sorted once by exit time for the
+    equity curve and streaks. Group folding is O(number of groups).
+
+    Args:
+        records: TradeRecords in any order
+        accounts: Account rows (account_id, account_name, is_default)
+
+    Returns:
+        Dictionary with stats, equity_curve, pair_stats, session_stats, account_stats
+    """
+    groups = {}
+    closed_sequence = []
+
+    for record in records:
+        key = (record.account_id, record.pair, record.session or '')
+        counters = groups.get(key)
+        if counters is None:
+            counters = groups[key] = new_counters()
+
+        counters['trade_count'] += 1
+        if record.status == 'OPEN':
+            counters['open_count'] += 1
+        elif record.status == 'CLOSED':
+            counters['closed_count'] += 1
+            if record.result == 'W':
+                counters['wins'] += 1
+            elif record.result == 'L':
+                counters['losses'] += 1
+            elif record.result == 'BE':
+                counters['break_even'] += 1
+            if record.exit_datetime:
+                closed_sequence.append(record)
+
+    closed_sequence.sort(key=lambda record: record.exit_datetime)
+
+    group_rows = [
+        {'account_id': account_id, 'pair': pair, 'session': session, **counters}
+        for (account_id, pair, session), counters in groups.items()
+    ]
+    return build_metrics(group_rows, closed_sequence, accounts)
+
+
+def build_metrics(group_rows: List[Dict], closed_sequence: List[TradeRecord], accounts: List[Dict]) -> Dict:
+    """
+    Assemble the metrics payload from group counters and the closed-trade sequence.
+
+    Args:
+        group_rows: Per-(account, pair, session) counter rows
+        closed_sequence: Closed TradeRecords sorted by exit time
+        accounts: Account rows (account_id, account_name, is_default)
+
+    Returns:
+        Dictionary with stats, equity_curve, pair_stats, session_stats, account_stats
+    """
+    summary = summarize_groups(group_rows, accounts)
+    curve = build_equity_curve(closed_sequence)
+
+    return {
+        'stats': build_overview(summary['totals'], curve),
+        'equity_curve': curve['equity_curve'],
+        'pair_stats': summary['pair_stats'],
+        'session_stats': summary['session_stats'],
+        'account_stats': summary['account_stats']
+    }
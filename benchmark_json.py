@@ -0,0 +1,118 @@
+"""
+Benchmark dashboard trade serialization: the previous path (per-row
+format_trade dict + Flask's default json provider) against json_serializer
+on API-shaped rows
+
+Usage:
+    python benchmark_json.py [--sizes 100 10000 100000] [--repeat 5]
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+import json_serializer
+
+
+def make_rows(count: int) -> list:
+    """Synthetic trade rows as the API-shaped query returns them (Decimal/datetime values)."""
+    base = datetime(2025, 1, 2, 8, 0, 0)
+    rows = []
+    for i in range(count):
+        entry = base + timedelta(minutes=37 * i)
+        closed = i % 3 != 0
+        rows.append({
+            'id': f"T{i + 1}",
+            'pair': ('EURUSD', 'GBPJPY', 'XAUUSD')[i % 3],
+            'direction': 'BUY' if i % 2 else 'SELL',
+            'entry_price': Decimal('1.08450') + Decimal(i % 500) / Decimal('10000'),
+            'stop_loss': Decimal('1.08000') if i % 4 else None,
+            'take_profit': Decimal('1.09500') if i % 5 else None,
+            'status': 'CLOSED' if closed else 'OPEN',
+            'result': ('W', 'L', 'BE')[i % 3] if closed else None,
+            'session': ('Asia', 'London', 'New York')[i % 3],
+            'news_risk': 'HIGH' if i % 7 == 0 else 'LOW',
+            'entry_datetime': entry,
+            'exit_datetime': entry + timedelta(hours=3) if closed else None,
+            'account': f"ACC{i % 3 + 1}"
+        })
+    return rows
+
+
+def to_legacy_row(row: dict) -> dict:
+    """The raw column names the previous query selected."""
+    legacy = dict(row)
+    legacy['trade_id'] = legacy.pop('id')
+    legacy['account_id'] = legacy.pop('account')
+    return legacy
+
+
+def legacy_format_trade(trade: dict) -> dict:
+    """Copy of the removed web_server.format_trade."""
+    return {
+        'id': trade['trade_id'],
+        'pair': trade['pair'],
+        'direction': trade['direction'],
+        'entry_price': float(trade['entry_price']),
+        'stop_loss': float(trade['stop_loss']) if trade['stop_loss'] else None,
+        'take_profit': float(trade['take_profit']) if trade['take_profit'] else None,
+        'status': trade['status'],
+        'result': trade['result'],
+        'session': trade['session'],
+        'news_risk': trade['news_risk'],
+        'entry_datetime': trade['entry_datetime'].isoformat() if trade['entry_datetime'] else None,
+        'exit_datetime': trade['exit_datetime'].isoformat() if trade['exit_datetime'] else None,
+        'account': trade['account_id']
+    }
+
+
+def legacy_dumps(rows: list) -> bytes:
+    # app.json.dumps with Flask's DefaultJSONProvider (how the dashboard cache body was built)
+    payload = {'recent_trades': [legacy_format_trade(row) for row in rows]}
+    return json.dumps(payload, sort_keys=True, ensure_ascii=True).encode('utf-8')
+
+
+def best_time(func, arg, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    """Run the benchmark and print one line per (size, serializer)."""
+    parser = argparse.ArgumentParser(description="Benchmark dashboard JSON serialization")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    candidates = [('legacy (format_trade + json)', legacy_dumps)]
+    for name, dumps in json_serializer.SERIALIZERS.items():
+        candidates.append((f"json_serializer[{name}]", lambda rows, dumps=dumps: dumps({'recent_trades': rows})))
+    if 'orjson' not in json_serializer.SERIALIZERS:
+        print("⚠️ orjson not installed - only the stdlib backend is measured")
+
+    for size in args.sizes:
+        rows = make_rows(size)
+        legacy_rows = [to_legacy_row(row) for row in rows]
+        expected = json.loads(legacy_dumps(legacy_rows))
+        print(f"\n📊 {size:,} trades")
+
+        baseline = None
+        for name, func in candidates:
+            data = legacy_rows if name.startswith('legacy') else rows
+            if json.loads(func(data)) != expected:
+                print(f"❌ {name} produced different JSON")
+                return 1
+            seconds = best_time(func, data, args.repeat)
+            baseline = baseline or seconds
+            print(f"   {name:<32} {seconds * 1000:9.2f} ms   {baseline / seconds:5.1f}x   "
+                  f"{len(func(data)) / 1024:9.1f} KiB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
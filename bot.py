@@ -1,6 +1,7 @@
 """
 Trading Journal Telegram Bot - Entry Point
 """
+import asyncio
 import logging
 import datetime
 import os
@@ -16,6 +17,9 @@ from telegram.ext import (
 )
 import config
 import database
+import fcs_client
+import subscriptions
+from database import run_db
 from features import trade_logger, trade_query, trade_update, news_rule, admin_commands, pair_manager, account_manager, user_manager
 
 # Initialize database on startup
@@ -26,6 +30,13 @@ except Exception as e:
     print(f"❌ Failed to initialize database: {e}")
     print(f"⚠️ Please make sure DATABASE_URL is set in environment variables")
 
+# Load news alert subscribers on startup
+try:
+    count = subscriptions.load_subscriptions()
+    print(f"✅ Loaded {count} news alert subscriber(s)")
+except Exception as e:
+    print(f"❌ Failed to load subscriptions: {e}")
+
 # Initialize news cache on startup
 try:
     news_rule.init_sample_news()
@@ -50,13 +61,11 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     user_id = user.id
     
-    # Subscribe user to news alerts
-    if 'subscribed_users' not in context.bot_data:
-        context.bot_data['subscribed_users'] = set()
-    context.bot_data['subscribed_users'].add(chat_id)
+    # Subscribe user to news alerts (persisted, so it survives redeploys)
+    await run_db(subscriptions.subscribe, chat_id, user_id)
     
     # Check if user is already registered in the database
-    user_exists = user_manager.user_exists_in_registry(user_id)
+    user_exists = await run_db(user_manager.user_exists_in_registry, user_id)
     is_new_user = not user_exists
     
     if is_new_user:
@@ -184,7 +193,8 @@ async def handle_setup_account_name(update: Update, context: ContextTypes.DEFAUL
     
     # Register user in database (creates user with default pairs and account)
     user = update.effective_user
-    user_manager.register_user(
+    await run_db(
+        user_manager.register_user,
         telegram_id=user_id,
         username=user.username,
         first_name=user.first_name,
@@ -194,7 +204,7 @@ async def handle_setup_account_name(update: Update, context: ContextTypes.DEFAUL
     
     # Update account name if not default
     if account_name != 'Main Account':
-        user_manager.rename_user_account(user_id, 'main', account_name)
+        await run_db(user_manager.rename_user_account, user_id, 'main', account_name)
     
     # Clear state
     context.user_data.pop('awaiting_account_name', None)
@@ -275,9 +285,11 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "/manageaccounts - 📊 Manage accounts\n"
         "/opentrades - 📊 View open trades\n"
         "/recenttrades - 📜 View recent trades\n"
+        "/stats - 📈 View your statistics\n"
         "/updatetrade - ✏️ Update trade result\n"
         "/news - 📰 View today's news\n"
         "/addnews - ➕ Add news event manually\n"
+        "/alerts - 🔔 News alert settings\n"
         "/help - 📚 This help guide\n\n"
         "💡 <i>Tip: Tap any command to use it instantly!</i>"
     )
@@ -286,6 +298,9 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
 async def post_init(application: Application) -> None:
     """Set bot commands in the menu after initialization."""
+    # News fetches from worker threads run on this loop's pooled HTTP client
+    fcs_client.bind_loop(asyncio.get_running_loop())
+    
     # Default commands (only start for new users)
     default_commands = [
         BotCommand("start", "🏠 Start the bot"),
@@ -294,6 +309,11 @@ async def post_init(application: Application) -> None:
     logger.info("✅ Bot commands menu set (default)")
 
 
+async def post_shutdown(application: Application) -> None:
+    """Release pooled connections on shutdown."""
+    await fcs_client.close()
+
+
 async def set_user_commands(application: Application, telegram_id: int) -> None:
     """Set full command menu for registered users."""
     full_commands = [
@@ -304,9 +324,11 @@ async def set_user_commands(application: Application, telegram_id: int) -> None:
         BotCommand("manageaccounts", "📊 Manage accounts"),
         BotCommand("opentrades", "📊 View open trades"),
         BotCommand("recenttrades", "📜 View recent trades"),
+        BotCommand("stats", "📈 View your statistics"),
         BotCommand("updatetrade", "✏️ Update trade result"),
         BotCommand("news", "📰 View today's news"),
         BotCommand("addnews", "➕ Add news event manually"),
+        BotCommand("alerts", "🔔 News alert settings"),
         BotCommand("help", "📚 Help guide"),
     ]
     try:
@@ -321,23 +343,40 @@ async def set_user_commands(application: Application, telegram_id: int) -> None:
         logger.error(f"❌ Error setting commands for user: {e}")
 
 
-def main() -> None:
-    """Start the bot."""
-    # Check if token is set
-    if not config.TELEGRAM_BOT_TOKEN:
-        logger.error("TELEGRAM_BOT_TOKEN not found! Please set it in .env file")
-        return
+def build_application(polling: bool = True) -> Application:
+    """
+    Create the Application with all handlers and scheduled jobs registered.
     
+    Args:
+        polling: False for webhook mode, where updates are pushed into
+            application.update_queue by webhook_server instead of an Updater
+    
+    Returns:
+        Configured (not yet initialized) Application
+    """
     # Create the Application with JobQueue
-    application = Application.builder().token(config.TELEGRAM_BOT_TOKEN).post_init(post_init).build()
+    # Updates are processed concurrently; DB calls run in the database.run_db
+    # thread pool so one slow query no longer stalls every other user.
+    builder = (
+        Application.builder()
+        .token(config.TELEGRAM_BOT_TOKEN)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .concurrent_updates(config.BOT_CONCURRENT_UPDATES)
+    )
+    if not polling:
+        builder = builder.updater(None)
+    application = builder.build()
 
     # Register command handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("opentrades", trade_query.show_open_trades))
     application.add_handler(CommandHandler("recenttrades", trade_query.show_recent_trades))
+    application.add_handler(CommandHandler("stats", trade_query.show_stats))
     application.add_handler(CommandHandler("news", admin_commands.show_upcoming_news))
     application.add_handler(CommandHandler("addnews", admin_commands.add_news_event_command))
+    application.add_handler(CommandHandler("alerts", admin_commands.alert_settings_command))
     application.add_handler(CommandHandler("dashboard", admin_commands.generate_dashboard_link))
     
     # Pair management conversation handler
@@ -425,6 +464,10 @@ def main() -> None:
         group=1  # Lower priority than conversation handlers
     )
     
+    if not config.BOT_SCHEDULED_JOBS:
+        logger.info("⏸️ Scheduled jobs disabled (BOT_SCHEDULED_JOBS=false)")
+        return application
+    
     # Set up news refresh job - every 4 hours (6 times per day)
     application.job_queue.run_repeating(
         admin_commands.refresh_news_cache_job,
@@ -433,12 +476,13 @@ def main() -> None:
         name='news_refresh'
     )
     
-    # Set up news alert job - check every minute for upcoming news
+    # Schedule one alert job per upcoming news event, resynced every 5 minutes
+    # so events added with /addnews on other replicas get their alert here
     application.job_queue.run_repeating(
-        admin_commands.send_news_alert,
-        interval=60,  # Run every 60 seconds
-        first=10,  # Start 10 seconds after bot starts
-        name='news_alerts'
+        admin_commands.schedule_news_alerts_job,
+        interval=300,
+        first=10,  # 10 seconds after bot starts
+        name='news_alerts_sync'
     )
     
     # Set up daily news refresh and summary - run at 00:05 UK time
@@ -447,6 +491,17 @@ def main() -> None:
         time=datetime.time(hour=0, minute=5),  # 00:05 UK time
         name='daily_news_summary'
     )
+    return application
+
+
+def main() -> None:
+    """Start the bot (long polling)."""
+    # Check if token is set
+    if not config.TELEGRAM_BOT_TOKEN:
+        logger.error("TELEGRAM_BOT_TOKEN not found! Please set it in .env file")
+        return
+    
+    application = build_application()
 
     # Start the Bot
     logger.info("🚀 Trading Journal Bot is starting...")
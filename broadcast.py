@@ -0,0 +1,171 @@
+"""
+Broadcast engine - fans a message out to many chats with bounded concurrency
+while staying under Telegram's global and per-chat rate limits
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TimedOut
+import config
+
+# BadRequest messages meaning the chat is gone for good - treated like Forbidden
+GONE_CHAT_ERRORS = ('chat not found', 'user is deactivated')
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart; can be paused after a 429."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        self._next = max(self._next, time.monotonic() + seconds)
+
+
+_global_limiter: Optional[_RateLimiter] = None
+_chat_next_send: Dict[int, float] = {}  # chat_id -> earliest monotonic time for the next message
+_recent_reports = deque(maxlen=20)
+
+
+def _get_global_limiter() -> _RateLimiter:
+    global _global_limiter
+    if _global_limiter is None:
+        _global_limiter = _RateLimiter(config.BROADCAST_RATE_PER_SECOND)
+    return _global_limiter
+
+
+async def _wait_for_chat(chat_id: int) -> None:
+    """Respect the per-chat limit across back-to-back broadcasts."""
+    now = time.monotonic()
+    ready_at = _chat_next_send.get(chat_id, 0.0)
+    _chat_next_send[chat_id] = max(now, ready_at) + config.BROADCAST_PER_CHAT_INTERVAL_SECONDS
+    if ready_at > now:
+        await asyncio.sleep(ready_at - now)
+
+
+def _prune_chat_limits() -> None:
+    now = time.monotonic()
+    for chat_id in [c for c, t in _chat_next_send.items() if t <= now]:
+        del _chat_next_send[chat_id]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+async def _deliver(bot, chat_id: int, text: str, send_kwargs: Dict, started: float,
+                   semaphore: asyncio.Semaphore, report: Dict, latencies: List[float]) -> None:
+    """Send one message, retrying on flood control and transient network errors."""
+    limiter = _get_global_limiter()
+    # Wait out the per-chat limit before taking a slot, so cooling-down chats don't block others
+    await _wait_for_chat(chat_id)
+    async with semaphore:
+        for attempt in range(config.BROADCAST_MAX_RETRIES + 1):
+            await limiter.wait()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text, **send_kwargs)
+                latencies.append(time.monotonic() - started)
+                report['sent'] += 1
+                return
+            except RetryAfter as e:
+                # Flood control applies to the whole bot, so hold back every sender
+                retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else e.retry_after
+                limiter.pause(retry_after)
+                report['retries'] += 1
+            except Forbidden:
+                # User blocked the bot or left the chat
+                report['blocked'].append(chat_id)
+                return
+            except BadRequest as e:
+                # A NetworkError subclass, but permanent - retrying can't help
+                if any(reason in str(e).lower() for reason in GONE_CHAT_ERRORS):
+                    report['blocked'].append(chat_id)
+                    return
+                print(f"Failed to send broadcast to {chat_id}: {e}")
+                break
+            except (TimedOut, NetworkError) as e:
+                if attempt == config.BROADCAST_MAX_RETRIES:
+                    print(f"Failed to send broadcast to {chat_id}: {e}")
+                    break
+                report['retries'] += 1
+                await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                print(f"Failed to send broadcast to {chat_id}: {e}")
+                break
+        report['failed'] += 1
+
+
+async def send_broadcast(bot, chat_ids: Iterable[int], text: str, name: str = 'broadcast',
+                         **send_kwargs) -> Dict:
+    """
+    Send the same message to many chats.
+
+    Args:
+        bot: telegram.Bot instance
+        chat_ids: Recipient chat IDs
+        text: Message text
+        name: Label used in logs and reports
+        **send_kwargs: Extra Bot.send_message arguments (e.g. parse_mode)
+
+    Returns:
+        Delivery report: counts, blocked chat IDs and latency percentiles (seconds)
+    """
+    recipients = list(dict.fromkeys(chat_ids))
+    report = {
+        'name': name,
+        'recipients': len(recipients),
+        'sent': 0,
+        'failed': 0,
+        'retries': 0,
+        'blocked': []
+    }
+    latencies: List[float] = []
+    started = time.monotonic()
+
+    semaphore = asyncio.Semaphore(config.BROADCAST_MAX_CONCURRENCY)
+    await asyncio.gather(*(
+        _deliver(bot, chat_id, text, send_kwargs, started, semaphore, report, latencies)
+        for chat_id in recipients
+    ))
+    _prune_chat_limits()
+
+    latencies.sort()
+    report['duration_seconds'] = round(time.monotonic() - started, 3)
+    report['latency_p50'] = round(_percentile(latencies, 50), 3)
+    report['latency_p90'] = round(_percentile(latencies, 90), 3)
+    report['latency_p99'] = round(_percentile(latencies, 99), 3)
+    report['latency_max'] = round(latencies[-1], 3) if latencies else 0.0
+    _recent_reports.append(report)
+
+    print(
+        f"📣 {name}: {report['sent']}/{report['recipients']} sent, "
+        f"{len(report['blocked'])} blocked, {report['failed']} failed in {report['duration_seconds']}s "
+        f"(p50 {report['latency_p50']}s, p90 {report['latency_p90']}s, p99 {report['latency_p99']}s)"
+    )
+    return report
+
+
+def get_recent_reports() -> List[Dict]:
+    """
+    Get delivery reports for the most recent broadcasts.
+
+    Returns:
+        List of report dictionaries, oldest first
+    """
+    return list(_recent_reports)
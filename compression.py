@@ -0,0 +1,150 @@
+"""
+Response compression - Accept-Encoding negotiation, gzip/brotli encoding for
+API responses, and build-time precompression of the dashboard's static assets
+
+Usage (after `npm run build`):
+    python compression.py web/dist
+"""
+import gzip
+import os
+import sys
+from typing import Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+MIN_COMPRESS_BYTES = 1024  # Smaller bodies aren't worth the CPU or the header bytes
+DYNAMIC_GZIP_LEVEL = 6     # Per-response: good ratio at low latency
+DYNAMIC_BROTLI_QUALITY = 5
+PRECOMPRESSED_EXTENSIONS = ('.js', '.mjs', '.css', '.html', '.svg', '.json', '.txt', '.map', '.xml', '.ico')
+FILE_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, best first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _parse_accept_encoding(header: str) -> dict:
+    accepted = {}
+    for part in (header or '').split(','):
+        fields = part.strip().split(';')
+        coding = fields[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: Tuple[str, ...] = None) -> Optional[str]:
+    """
+    Pick the best content-coding the client accepts.
+
+    Args:
+        accept_encoding: Accept-Encoding request header
+        available: Candidate encodings, best first (defaults to supported_encodings())
+
+    Returns:
+        'br', 'gzip', or None for identity
+    """
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in available or supported_encodings():
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body for on-the-fly delivery.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: 'br' or 'gzip'
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=DYNAMIC_BROTLI_QUALITY)
+    # mtime=0 keeps the output (and anything derived from it) deterministic
+    return gzip.compress(body, compresslevel=DYNAMIC_GZIP_LEVEL, mtime=0)
+
+
+def find_precompressed(directory: str, path: str, accept_encoding: str) -> Tuple[str, Optional[str]]:
+    """
+    Find the best precompressed variant of a static file the client accepts.
+
+    Args:
+        directory: Static root
+        path: File path relative to directory
+        accept_encoding: Accept-Encoding request header
+
+    Returns:
+        (path to serve, encoding) - the original path and None if no variant fits
+    """
+    available = tuple(
+        coding for coding, suffix in FILE_SUFFIXES.items()
+        if os.path.isfile(os.path.join(directory, path + suffix))
+    )
+    encoding = choose_encoding(accept_encoding, available) if available else None
+    if encoding is None:
+        return path, None
+    return path + FILE_SUFFIXES[encoding], encoding
+
+
+def precompress_directory(directory: str) -> int:
+    """
+    Write maximum-compression .gz (and .br, if brotli is installed) next to
+    every compressible file, keeping only variants that are actually smaller.
+
+    Args:
+        directory: Build output directory (e.g. web/dist)
+
+    Returns:
+        Number of compressed files written
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(PRECOMPRESSED_EXTENSIONS):
+                continue
+            source = os.path.join(root, name)
+            with open(source, 'rb') as f:
+                body = f.read()
+            if len(body) < MIN_COMPRESS_BYTES:
+                continue
+
+            variants = {'.gz': gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants['.br'] = brotli.compress(body, quality=11)
+            for suffix, compressed in variants.items():
+                if len(compressed) < len(body):
+                    with open(source + suffix, 'wb') as f:
+                        f.write(compressed)
+                    written += 1
+    return written
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join('web', 'dist')
+    if not os.path.isdir(target):
+        print(f"❌ {target} not found - run `cd web && npm run build` first")
+        sys.exit(1)
+    if brotli is None:
+        print("⚠️ brotli not installed - writing .gz files only")
+    print(f"✅ Wrote {precompress_directory(target)} precompressed files in {target}")
@@ -25,9 +25,72 @@ SESSIONS = {
 # News Risk Settings
 NEWS_RISK_WINDOW_MINUTES = 10  # ±10 minutes around high-impact news
 FCS_API_KEY = os.getenv('FCS_API_KEY', '')  # Get free key from fcsapi.com
+FCS_API_BASE_URL = os.getenv('FCS_API_BASE_URL', 'https://fcsapi.com/api-v3')  # Point at fcs_stub_server.py for offline testing
+FCS_TIMEOUT_SECONDS = float(os.getenv('FCS_TIMEOUT_SECONDS', '10'))
+FCS_MAX_RETRIES = int(os.getenv('FCS_MAX_RETRIES', '3'))
+FCS_RETRY_MAX_DELAY_SECONDS = float(os.getenv('FCS_RETRY_MAX_DELAY_SECONDS', '8'))
+FCS_BREAKER_FAILURES = int(os.getenv('FCS_BREAKER_FAILURES', '3'))  # Consecutive failed fetches before the circuit opens
+FCS_BREAKER_RESET_SECONDS = int(os.getenv('FCS_BREAKER_RESET_SECONDS', '300'))  # Wait before a trial request
+NEWS_PREFETCH_DAYS = int(os.getenv('NEWS_PREFETCH_DAYS', '7'))  # Fetch today plus this many days ahead
+NEWS_FAR_DAY_REFRESH_HOURS = int(os.getenv('NEWS_FAR_DAY_REFRESH_HOURS', '24'))  # Refetch days after tomorrow this often
+NEWS_HISTORY_DAYS = int(os.getenv('NEWS_HISTORY_DAYS', '90'))  # Keep past events for back-testing news risk
+NEWS_NEAR_DAY_REFRESH_MINUTES = int(os.getenv('NEWS_NEAR_DAY_REFRESH_MINUTES', '60'))  # Min age before refetching today/tomorrow
+NEWS_INDEX_TTL_SECONDS = int(os.getenv('NEWS_INDEX_TTL_SECONDS', '60'))  # How often replicas check the news tables for changes
 
 # CSV File Path
 TRADES_CSV_PATH = 'data/trades.csv'
-NEWS_CACHE_PATH = 'data/news_cache.json'
+NEWS_CACHE_PATH = 'data/news_cache.json'  # Local snapshot of the news calendar (used if MySQL is unreachable)
 USER_REGISTRY_PATH = 'data/users_registry.csv'  # Admin-only user registration data
 DATA_DIR = 'data'
+
+# Database Connection Pool
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', '10'))  # Max wait for a free connection
+DB_POOL_MAX_LIFETIME_SECONDS = int(os.getenv('DB_POOL_MAX_LIFETIME_SECONDS', '1800'))  # Recycle after 30 min
+DB_POOL_PING_INTERVAL_SECONDS = int(os.getenv('DB_POOL_PING_INTERVAL_SECONDS', '30'))  # Ping idle connections older than this
+
+# Dashboard Web Server
+# Each gunicorn worker has its own DB pool: plan for WEB_WORKERS x DB_POOL_SIZE connections
+WEB_SERVER = os.getenv('WEB_SERVER', 'gunicorn').lower()  # gunicorn, or flask for the development server
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', '1'))  # Processes; see DEPLOYMENT.md for what stays per-worker
+WEB_THREADS = int(os.getenv('WEB_THREADS', '4'))  # Keep <= DB_POOL_SIZE so requests don't queue for connections
+WEB_TIMEOUT_SECONDS = int(os.getenv('WEB_TIMEOUT_SECONDS', '30'))  # Restart a worker stuck on one request this long
+WEB_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv('WEB_GRACEFUL_TIMEOUT_SECONDS', '20'))  # Drain time on SIGTERM
+HEALTH_DB_TIMEOUT_SECONDS = float(os.getenv('HEALTH_DB_TIMEOUT_SECONDS', '2'))  # /readyz fails if no connection within this
+ADMIN_API_SECRET = os.getenv('ADMIN_API_SECRET', '')  # X-Admin-Secret for /api/cache-stats and /api/token-stats (unset = disabled)
+
+# Bot Concurrency
+BOT_CONCURRENT_UPDATES = int(os.getenv('BOT_CONCURRENT_UPDATES', '16'))  # Max updates handled in parallel
+BOT_SCHEDULED_JOBS = os.getenv('BOT_SCHEDULED_JOBS', 'true').lower() == 'true'  # false: handle updates only (no news refresh, alerts or summaries)
+
+# Webhook Mode (python start.py webhook)
+# Telegram POSTs updates to WEBHOOK_URL + WEBHOOK_PATH, served on PORT next to the dashboard
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '').rstrip('/')  # Public HTTPS base URL, e.g. https://journal.example.com
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/telegram/webhook')
+WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN', '')  # 1-256 chars of A-Z a-z 0-9 _ -
+WEBHOOK_MAX_BODY_BYTES = int(os.getenv('WEBHOOK_MAX_BODY_BYTES', '1048576'))
+
+# Broadcasts (news alerts, daily summaries)
+# Telegram allows ~30 messages/second overall and ~1 message/second per chat
+BROADCAST_MAX_CONCURRENCY = int(os.getenv('BROADCAST_MAX_CONCURRENCY', '20'))
+BROADCAST_RATE_PER_SECOND = float(os.getenv('BROADCAST_RATE_PER_SECOND', '25'))
+BROADCAST_PER_CHAT_INTERVAL_SECONDS = float(os.getenv('BROADCAST_PER_CHAT_INTERVAL_SECONDS', '1.0'))
+BROADCAST_MAX_RETRIES = int(os.getenv('BROADCAST_MAX_RETRIES', '3'))
+
+# Dashboard Link Tokens
+# database: shared by every process/replica; jwt: stateless, needs the same secret in bot and web;
+# memory: only when the bot and dashboard share a process (START_MODE=webhook, or both with WEB_SERVER=flask)
+DASHBOARD_TOKEN_STORE = os.getenv('DASHBOARD_TOKEN_STORE', 'database').lower()
+DASHBOARD_TOKEN_SECRET = os.getenv('DASHBOARD_TOKEN_SECRET', '')  # Signing key for DASHBOARD_TOKEN_STORE=jwt
+DASHBOARD_TOKEN_CACHE_SIZE = int(os.getenv('DASHBOARD_TOKEN_CACHE_SIZE', '10000'))  # Verified tokens kept per process
+DASHBOARD_TOKEN_CACHE_TTL_SECONDS = int(os.getenv('DASHBOARD_TOKEN_CACHE_TTL_SECONDS', '300'))  # Recheck database tokens this often
+DASHBOARD_TOKEN_SWEEP_INTERVAL_SECONDS = int(os.getenv('DASHBOARD_TOKEN_SWEEP_INTERVAL_SECONDS', '60'))  # Expired-token sweeper period (0 = off)
+
+# API JSON serializer: auto (orjson if installed), orjson or stdlib
+JSON_SERIALIZER = os.getenv('JSON_SERIALIZER', 'auto').lower()
+
+# Dashboard Response Cache
+# Entries are checked against users.data_version, so writes from any process
+# invalidate immediately; the TTL only bounds writes that don't bump it.
+DASHBOARD_CACHE_TTL_SECONDS = int(os.getenv('DASHBOARD_CACHE_TTL_SECONDS', '30'))
+DASHBOARD_CACHE_MAX_USERS = int(os.getenv('DASHBOARD_CACHE_MAX_USERS', '1000'))
@@ -0,0 +1,149 @@
+"""
+Dashboard response cache - per-user serialized dashboard payloads keyed on
+users.data_version, which every write to a user's trades or accounts bumps
+in the same transaction, so entries and ETags stay valid across processes
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+import config
+
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # telegram_id -> cache entry (LRU order)
+_stats = {
+    'hits': 0,
+    'misses': 0,
+    'not_modified': 0,
+    'invalidations': 0,
+    'evictions': 0
+}
+
+
+def _make_etag(telegram_id: int, version: int, digest: bytes) -> str:
+    # Same data version and same bytes give the same ETag in every process
+    return f"{telegram_id}-{version}-{digest[:6].hex()}"
+
+
+def bump_version(cursor, telegram_id: int) -> None:
+    """
+    Mark a user's dashboard as stale for every process.
+    Call inside the transaction that writes to that user's trades or accounts.
+
+    Args:
+        cursor: Cursor of the writing transaction
+        telegram_id: User's Telegram ID
+    """
+    cursor.execute("""
+        UPDATE users SET data_version = data_version + 1 WHERE telegram_id = %s
+    """, (telegram_id,))
+    invalidate_user(telegram_id)
+
+
+def fetch_version(cursor, telegram_id: int) -> Optional[int]:
+    """
+    Read a user's current data version.
+
+    Args:
+        cursor: Database cursor
+        telegram_id: User's Telegram ID
+
+    Returns:
+        The version, or None if the user doesn't exist
+    """
+    cursor.execute("SELECT data_version FROM users WHERE telegram_id = %s", (telegram_id,))
+    row = cursor.fetchone()
+    return row['data_version'] if row else None
+
+
+def invalidate_user(telegram_id: int) -> None:
+    """
+    Drop this process's cached dashboard for a user.
+    Other processes notice the bumped data version on their next lookup.
+
+    Args:
+        telegram_id: User's Telegram ID
+    """
+    with _lock:
+        if _entries.pop(telegram_id, None) is not None:
+            _stats['invalidations'] += 1
+
+
+def get(telegram_id: int, version: int) -> Optional[Dict]:
+    """
+    Get a fresh cached dashboard entry for a user.
+
+    Args:
+        telegram_id: User's Telegram ID
+        version: User's current data version (see fetch_version)
+
+    Returns:
+        Dictionary with body and etag, or None on a miss
+    """
+    with _lock:
+        entry = _entries.get(telegram_id)
+        if (entry is None
+                or entry['version'] != version
+                or time.monotonic() > entry['expires_at']):
+            _stats['misses'] += 1
+            return None
+        _entries.move_to_end(telegram_id)
+        _stats['hits'] += 1
+        return entry
+
+
+def put(telegram_id: int, version: int, body: bytes) -> Dict:
+    """
+    Cache a freshly serialized dashboard payload.
+
+    The ETag changes when the data version changes, or when a TTL refresh
+    produces different bytes (e.g. a write that didn't bump the version).
+
+    Args:
+        telegram_id: User's Telegram ID
+        version: Data version read before the payload was built
+        body: Serialized JSON response body
+
+    Returns:
+        The stored cache entry
+    """
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    entry = {
+        'body': body,
+        'version': version,
+        'etag': _make_etag(telegram_id, version, digest),
+        'expires_at': time.monotonic() + config.DASHBOARD_CACHE_TTL_SECONDS
+    }
+
+    with _lock:
+        _entries[telegram_id] = entry
+        _entries.move_to_end(telegram_id)
+
+        while len(_entries) > config.DASHBOARD_CACHE_MAX_USERS:
+            _entries.popitem(last=False)
+            _stats['evictions'] += 1
+
+        return entry
+
+
+def record_not_modified() -> None:
+    """Count a request answered with 304 Not Modified."""
+    with _lock:
+        _stats['not_modified'] += 1
+
+
+def get_cache_stats() -> Dict:
+    """
+    Get cache hit/miss counters.
+
+    Returns:
+        Dictionary of counters plus current entry count and hit ratio
+    """
+    with _lock:
+        snapshot = dict(_stats)
+        snapshot['entries'] = len(_entries)
+    lookups = snapshot['hits'] + snapshot['misses']
+    snapshot['hit_ratio'] = round(snapshot['hits'] / lookups, 4) if lookups else 0.0
+    return snapshot
@@ -0,0 +1,142 @@
+"""
+Dashboard statistics engine - builds trade statistics from the user_stats
+rollup and a few narrow queries instead of loading every trade row
+"""
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+import analytics
+
+
+# Trade columns in the dashboard API's JSON shape, so rows go to the serializer
+# as-is (json_serializer handles Decimal/datetime). NULLIF: 0 SL/TP means "not set".
+API_TRADE_COLUMNS = """
+    trade_id AS id, pair, direction, entry_price,
+    NULLIF(stop_loss, 0) AS stop_loss, NULLIF(take_profit, 0) AS take_profit,
+    status, result, session, news_risk,
+    entry_datetime, exit_datetime, account_id AS account
+"""
+
+
+def fetch_stats_rollup(cursor, user_id: int) -> List[Dict]:
+    """
+    Read the user's pre-aggregated (account, pair, session) counters.
+
+    Args:
+        cursor: Open dictionary cursor
+        user_id: Internal user ID
+
+    Returns:
+        List of user_stats rows
+    """
+    cursor.execute("""
+        SELECT account_id, pair, session,
+               trade_count, open_count, closed_count, wins, losses, break_even
+        FROM user_stats
+        WHERE user_id = %s AND trade_count > 0
+    """, (user_id,))
+    return cursor.fetchall()
+
+
+def fetch_closed_sequence(cursor, user_id: int) -> List[Dict]:
+    """
+    Get the minimal columns of closed trades in exit order (equity curve / streaks).
+
+    Args:
+        cursor: Open dictionary cursor
+        user_id: Internal user ID
+
+    Returns:
+        List of {trade_id, result, exit_datetime} rows, oldest exit first
+    """
+    cursor.execute("""
+        SELECT trade_id, result, exit_datetime
+        FROM trades
+        WHERE user_id = %s AND status = 'CLOSED' AND exit_datetime IS NOT NULL
+        ORDER BY exit_datetime ASC, entry_datetime DESC
+    """, (user_id,))
+    return cursor.fetchall()
+
+
+def fetch_recent_trades(cursor, user_id: int, limit: int = 100) -> List[Dict]:
+    """
+    Get the most recent trades with only the columns the dashboard displays.
+
+    Args:
+        cursor: Open dictionary cursor
+        user_id: Internal user ID
+        limit: Maximum number of trades to return
+
+    Returns:
+        List of trade rows in API shape (newest first)
+    """
+    cursor.execute(f"""
+        SELECT {API_TRADE_COLUMNS}
+        FROM trades
+        WHERE user_id = %s
+        ORDER BY entry_datetime DESC
+        LIMIT %s
+    """, (user_id, limit))
+    return cursor.fetchall()
+
+
+def get_dashboard_stats(cursor, user_id: int, accounts: List[Dict]) -> Dict:
+    """
+    Compute every dashboard statistic for a user.
+
+    Args:
+        cursor: Open dictionary cursor
+        user_id: Internal user ID
+        accounts: User's account rows
+
+    Returns:
+        Dictionary with stats, equity_curve, pair_stats, session_stats, account_stats
+    """
+    closed_sequence = [analytics.record_from_row(row) for row in fetch_closed_sequence(cursor, user_id)]
+    return analytics.build_metrics(fetch_stats_rollup(cursor, user_id), closed_sequence, accounts)
+
+
+def fetch_trades_page(cursor, user_id: int, filters: Dict,
+                      after: Optional[Tuple[datetime, int]] = None, limit: int = 50) -> List[Dict]:
+    """
+    Get one page of trades, newest first, using keyset pagination on (entry_datetime, id).
+
+    Args:
+        cursor: Open dictionary cursor
+        user_id: Internal user ID
+        filters: Optional account_id, pair, session, status, result,
+                 date_from (inclusive) and date_to (exclusive) values
+        after: (entry_datetime, id) of the last trade on the previous page
+        limit: Page size
+
+    Returns:
+        Up to limit + 1 trade rows in API shape plus notes and the internal
+        row_id for cursors (the extra row signals another page)
+    """
+    clauses = ["user_id = %s"]
+    params = [user_id]
+
+    for column in ('account_id', 'pair', 'session', 'status', 'result'):
+        if filters.get(column) is not None:
+            clauses.append(f"{column} = %s")
+            params.append(filters[column])
+
+    if filters.get('date_from') is not None:
+        clauses.append("entry_datetime >= %s")
+        params.append(filters['date_from'])
+    if filters.get('date_to') is not None:
+        clauses.append("entry_datetime < %s")
+        params.append(filters['date_to'])
+
+    if after is not None:
+        clauses.append("(entry_datetime < %s OR (entry_datetime = %s AND id < %s))")
+        params.extend([after[0], after[0], after[1]])
+
+    params.append(limit + 1)
+    cursor.execute(f"""
+        SELECT {API_TRADE_COLUMNS}, notes, id AS row_id
+        FROM trades
+        WHERE {' AND '.join(clauses)}
+        ORDER BY entry_datetime DESC, id DESC
+        LIMIT %s
+    """, params)
+    return cursor.fetchall()
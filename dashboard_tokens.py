@@ -0,0 +1,374 @@
+"""
+Dashboard token store - issues and verifies /dashboard link tokens.
+
+Backends (DASHBOARD_TOKEN_STORE):
+    database - dashboard_tokens table, shared by every process and replica
+    jwt      - stateless HS256 tokens signed with DASHBOARD_TOKEN_SECRET
+    memory   - process-local dicts; only works when the bot and the dashboard
+               share a process (START_MODE=webhook, or START_MODE=both with
+               WEB_SERVER=flask) - start.py refuses it otherwise
+"""
+import heapq
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import jwt
+from database import get_db_connection
+import config
+
+
+REUSE_MIN_REMAINING_SECONDS = 3600  # Reuse a user's token if it's valid for at least another hour
+
+
+class _VerifiedCache:
+    """Bounded LRU of verified tokens: token -> (telegram_id, valid-until epoch)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or time.time() >= entry[1]:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, telegram_id: int, valid_until: float) -> None:
+        with self._lock:
+            self._entries[token] = (telegram_id, valid_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class MemoryTokenStore:
+    """Random tokens kept in this process only (lost on restart)."""
+
+    def __init__(self):
+        self.active_tokens: Dict[str, Dict] = {}  # token -> {'telegram_id', 'expires' (epoch)}
+        self.user_tokens: Dict[int, str] = {}     # telegram_id -> active token for reuse
+        # (expires, token) min-heap; entries for tokens dropped early are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _drop(self, token: str) -> None:
+        data = self.active_tokens.pop(token, None)
+        if data and self.user_tokens.get(data['telegram_id']) == token:
+            del self.user_tokens[data['telegram_id']]
+
+    def issue(self, telegram_id: int, expires_hours: int) -> Tuple[str, bool]:
+        now = time.time()
+        with self._lock:
+            existing = self.user_tokens.get(telegram_id)
+            if existing in self.active_tokens:
+                if now + REUSE_MIN_REMAINING_SECONDS < self.active_tokens[existing]['expires']:
+                    return existing, True
+                self._drop(existing)
+
+            token = secrets.token_urlsafe(32)
+            expires = now + expires_hours * 3600
+            self.active_tokens[token] = {'telegram_id': telegram_id, 'expires': expires}
+            self.user_tokens[telegram_id] = token
+            heapq.heappush(self._expiry_heap, (expires, token))
+            return token, False
+
+    def verify(self, token: str) -> Optional[Tuple[int, float]]:
+        with self._lock:
+            data = self.active_tokens.get(token)
+            if data is None:
+                return None
+            if time.time() > data['expires']:
+                self._drop(token)
+                return None
+            return data['telegram_id'], data['expires']
+
+    def cleanup_expired(self) -> int:
+        # Pops only expired heap entries: O(k log n) for k expired tokens
+        now = time.time()
+        removed = 0
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                expires, token = heapq.heappop(self._expiry_heap)
+                data = self.active_tokens.get(token)
+                if data is not None and data['expires'] == expires:
+                    self._drop(token)
+                    removed += 1
+            # Stale entries (tokens dropped early) outnumbering live ones - rebuild
+            if len(self._expiry_heap) > 2 * len(self.active_tokens) + 64:
+                self._expiry_heap = [(data['expires'], token) for token, data in self.active_tokens.items()]
+                heapq.heapify(self._expiry_heap)
+        return removed
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self.active_tokens)
+
+    def heap_size(self) -> int:
+        with self._lock:
+            return len(self._expiry_heap)
+
+
+class DatabaseTokenStore:
+    """Random tokens in the dashboard_tokens table; expiry compared in UTC by MySQL."""
+
+    def issue(self, telegram_id: int, expires_hours: int) -> Tuple[str, bool]:
+        with get_db_connection() as cursor:
+            cursor.execute("""
+                SELECT token FROM dashboard_tokens
+                WHERE telegram_id = %s AND expires_at > UTC_TIMESTAMP() + INTERVAL %s SECOND
+                ORDER BY expires_at DESC
+                LIMIT 1
+            """, (telegram_id, REUSE_MIN_REMAINING_SECONDS))
+            row = cursor.fetchone()
+            if row:
+                return row['token'], True
+
+            # One live token per user, as before
+            cursor.execute("DELETE FROM dashboard_tokens WHERE telegram_id = %s", (telegram_id,))
+            token = secrets.token_urlsafe(32)
+            cursor.execute("""
+                INSERT INTO dashboard_tokens (token, telegram_id, expires_at)
+                VALUES (%s, %s, UTC_TIMESTAMP() + INTERVAL %s HOUR)
+            """, (token, telegram_id, expires_hours))
+            return token, False
+
+    def verify(self, token: str) -> Optional[Tuple[int, float]]:
+        with get_db_connection() as cursor:
+            cursor.execute("""
+                SELECT telegram_id, TIMESTAMPDIFF(SECOND, UTC_TIMESTAMP(), expires_at) AS remaining
+                FROM dashboard_tokens
+                WHERE token = %s AND expires_at > UTC_TIMESTAMP()
+            """, (token,))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return row['telegram_id'], time.time() + row['remaining']
+
+    def cleanup_expired(self) -> int:
+        with get_db_connection() as cursor:
+            cursor.execute("DELETE FROM dashboard_tokens WHERE expires_at <= UTC_TIMESTAMP()")
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with get_db_connection() as cursor:
+            cursor.execute("SELECT COUNT(*) AS live FROM dashboard_tokens WHERE expires_at > UTC_TIMESTAMP()")
+            return cursor.fetchone()['live']
+
+
+class JWTTokenStore:
+    """Stateless signed tokens; any process with the secret can verify them."""
+
+    ALGORITHM = 'HS256'
+
+    def __init__(self, secret: str):
+        if not secret:
+            raise RuntimeError("DASHBOARD_TOKEN_SECRET must be set when DASHBOARD_TOKEN_STORE=jwt")
+        self.secret = secret
+        # Tokens issued by this process, kept only so /dashboard can hand out the same link again
+        self._issued: Dict[int, Tuple[str, int]] = {}  # telegram_id -> (token, exp)
+        self._expiry_heap: List[Tuple[int, int]] = []  # (exp, telegram_id)
+        self._lock = threading.Lock()
+
+    def issue(self, telegram_id: int, expires_hours: int) -> Tuple[str, bool]:
+        now = int(time.time())
+        with self._lock:
+            existing = self._issued.get(telegram_id)
+            if existing is not None and existing[1] - now > REUSE_MIN_REMAINING_SECONDS:
+                return existing[0], True
+
+            expires = now + expires_hours * 3600
+            claims = {'sub': str(telegram_id), 'iat': now, 'exp': expires}
+            token = jwt.encode(claims, self.secret, algorithm=self.ALGORITHM)
+            self._issued[telegram_id] = (token, expires)
+            heapq.heappush(self._expiry_heap, (expires, telegram_id))
+            return token, False
+
+    def verify(self, token: str) -> Optional[Tuple[int, float]]:
+        try:
+            claims = jwt.decode(token, self.secret, algorithms=[self.ALGORITHM], options={'require': ['exp', 'sub']})
+            return int(claims['sub']), float(claims['exp'])
+        except (jwt.PyJWTError, ValueError):
+            return None
+
+    def cleanup_expired(self) -> int:
+        now = time.time()
+        removed = 0
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires, telegram_id = heapq.heappop(self._expiry_heap)
+                issued = self._issued.get(telegram_id)
+                if issued is not None and issued[1] == expires:
+                    del self._issued[telegram_id]
+                    removed += 1
+        return removed
+
+    def count(self) -> int:
+        # Only known for tokens issued by this process (expired ones go at the next sweep)
+        with self._lock:
+            return len(self._issued)
+
+    def heap_size(self) -> int:
+        with self._lock:
+            return len(self._expiry_heap)
+
+
+_store = None
+_store_lock = threading.Lock()
+_verified = _VerifiedCache(config.DASHBOARD_TOKEN_CACHE_SIZE)
+_sweeper = None
+_sweep_stats = {
+    'sweeps': 0,
+    'removed': 0,
+    'last_sweep_ms': 0.0,
+    'max_sweep_ms': 0.0
+}
+_sweep_stats_lock = threading.Lock()
+
+
+def get_store():
+    """Get the configured token store (created on first use, with its sweeper)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            kind = config.DASHBOARD_TOKEN_STORE
+            if kind == 'database':
+                _store = DatabaseTokenStore()
+            elif kind == 'jwt':
+                _store = JWTTokenStore(config.DASHBOARD_TOKEN_SECRET)
+            elif kind == 'memory':
+                _store = MemoryTokenStore()
+            else:
+                raise RuntimeError(f"Unknown DASHBOARD_TOKEN_STORE '{kind}' (use database, jwt or memory)")
+            _start_sweeper()
+        return _store
+
+
+def _sweep_forever(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            cleanup_expired_tokens()
+        except Exception as e:
+            print(f"❌ Token sweep failed: {e}")
+
+
+def _start_sweeper() -> None:
+    """Start the background expiry sweeper (once per process)."""
+    global _sweeper
+    interval = config.DASHBOARD_TOKEN_SWEEP_INTERVAL_SECONDS
+    if _sweeper is not None or interval <= 0:
+        return
+    _sweeper = threading.Thread(target=_sweep_forever, args=(interval,), name='dashboard-token-sweeper', daemon=True)
+    _sweeper.start()
+
+
+def issue_token(telegram_id: int, expires_hours: int = 24) -> Tuple[str, bool]:
+    """
+    Generate or reuse a dashboard token for a user.
+    One token per user - reuses it while it has at least an hour left.
+
+    Args:
+        telegram_id: User's Telegram ID
+        expires_hours: Lifetime of a newly issued token
+
+    Returns:
+        (token, reused) tuple
+    """
+    token, reused = get_store().issue(telegram_id, expires_hours)
+    print(f"♻️ Reusing existing token for user {telegram_id}" if reused
+          else f"🔑 Generated new token for user {telegram_id}")
+    return token, reused
+
+
+def verify_token(token: str) -> Optional[int]:
+    """
+    Verify a dashboard token.
+
+    Database and JWT results are cached in a bounded LRU, so repeat requests
+    with the same link skip the query/signature check (database entries are
+    rechecked after DASHBOARD_TOKEN_CACHE_TTL_SECONDS).
+
+    Args:
+        token: Token from the dashboard URL
+
+    Returns:
+        telegram_id, or None if the token is invalid or expired
+    """
+    if not token:
+        return None
+    store = get_store()
+    if isinstance(store, MemoryTokenStore):
+        # Already a dict lookup - nothing to cache
+        result = store.verify(token)
+        return result[0] if result else None
+
+    telegram_id = _verified.get(token)
+    if telegram_id is not None:
+        return telegram_id
+
+    result = store.verify(token)
+    if result is None:
+        return None
+    telegram_id, valid_until = result
+    if isinstance(store, DatabaseTokenStore):
+        valid_until = min(valid_until, time.time() + config.DASHBOARD_TOKEN_CACHE_TTL_SECONDS)
+    _verified.put(token, telegram_id, valid_until)
+    return telegram_id
+
+
+def cleanup_expired_tokens() -> int:
+    """
+    Remove expired tokens from the store.
+
+    Returns:
+        Number of tokens removed
+    """
+    started = time.perf_counter()
+    removed = get_store().cleanup_expired()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    with _sweep_stats_lock:
+        _sweep_stats['sweeps'] += 1
+        _sweep_stats['removed'] += removed
+        _sweep_stats['last_sweep_ms'] = round(elapsed_ms, 3)
+        _sweep_stats['max_sweep_ms'] = max(_sweep_stats['max_sweep_ms'], round(elapsed_ms, 3))
+    if removed:
+        print(f"🧹 Cleaned up {removed} expired tokens")
+    return removed
+
+
+def get_token_stats() -> Dict:
+    """
+    Get token store gauges for memory sizing.
+
+    Returns:
+        Dictionary with the backend, live token count, sweep counters/durations
+        and verify-cache counters
+    """
+    store = get_store()
+    with _sweep_stats_lock:
+        snapshot = dict(_sweep_stats)
+    snapshot['store'] = config.DASHBOARD_TOKEN_STORE
+    snapshot['live_tokens'] = store.count()
+    if hasattr(store, 'heap_size'):
+        snapshot['expiry_heap_size'] = store.heap_size()
+    lookups = _verified.hits + _verified.misses
+    snapshot['verify_cache_entries'] = len(_verified)
+    snapshot['verify_cache_hit_ratio'] = round(_verified.hits / lookups, 4) if lookups else 0.0
+    return snapshot
+
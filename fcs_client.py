@@ -0,0 +1,238 @@
+"""
+FCS economic calendar client - async HTTP with a persistent connection pool,
+jittered retries and a circuit breaker so a slow or failing API never
+blocks the bot's event loop
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+import httpx
+import config
+
+
+class _RetryableStatus(Exception):
+    """HTTP status worth retrying (429 or 5xx)."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling the API after repeated failures.
+
+    closed -> open after failure_threshold consecutive failures;
+    open -> half-open after reset_seconds, letting one trial request through;
+    half-open -> closed on success, back to open on failure.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial that ended without a verdict (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class FCSClient:
+    """Economic calendar client; one pooled httpx.AsyncClient per event loop."""
+
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.breaker = CircuitBreaker(config.FCS_BREAKER_FAILURES, config.FCS_BREAKER_RESET_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+
+    async def _close_stale_client(self) -> None:
+        """Close a client created on another event loop before it's replaced."""
+        client, client_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client_loop.is_running():
+            # Its connections belong to that loop, so close it there
+            asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"⚠️ Could not close stale FCS HTTP client: {e}")
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is not loop:
+            await self._close_stale_client()
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(config.FCS_TIMEOUT_SECONDS),
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2)
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def fetch_calendar(self, date_from: str, date_to: str) -> Optional[List[Dict]]:
+        """
+        Fetch raw calendar events for an inclusive date range.
+
+        Args:
+            date_from: 'YYYY-MM-DD'
+            date_to: 'YYYY-MM-DD'
+
+        Returns:
+            Raw FCS event dictionaries, or None on error / while the circuit is open
+        """
+        if not self.breaker.allow():
+            print(f"⚠️ FCS API circuit {self.breaker.state} - skipping request")
+            return None
+
+        params = {'access_key': self.api_key, 'date_from': date_from, 'date_to': date_to}
+        try:
+            events = await self._fetch_with_retries(params)
+        except BaseException:
+            # Cancelled mid-request: otherwise a half-open circuit would wait for this trial forever
+            self.breaker.release_trial()
+            raise
+
+        if events is None:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return events
+
+    async def _fetch_with_retries(self, params: dict) -> Optional[List[Dict]]:
+        client = await self._get_http_client()
+        for attempt in range(config.FCS_MAX_RETRIES + 1):
+            try:
+                response = await client.get('/forex/economy_cal', params=params)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise _RetryableStatus(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                data = response.json()
+            except (httpx.TransportError, _RetryableStatus) as e:
+                if attempt == config.FCS_MAX_RETRIES:
+                    print(f"❌ Error fetching from FCS API: {e}")
+                    break
+                # Full jitter: spread retries so replicas don't hammer the API in step
+                delay = random.uniform(0, min(config.FCS_RETRY_MAX_DELAY_SECONDS, 0.5 * 2 ** attempt))
+                await asyncio.sleep(delay)
+                continue
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"❌ Error fetching from FCS API: {e}")
+                break
+
+            if data.get('status') != True:
+                # Bad key, quota exhausted... retrying won't help
+                print(f"❌ FCS API Error: {data.get('msg', 'Unknown error')}")
+                break
+
+            return data.get('response', [])
+
+        return None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+
+_client: Optional[FCSClient] = None
+_bound_loop = None
+
+
+def get_client() -> FCSClient:
+    """Get the process-wide FCS client."""
+    global _client
+    if _client is None:
+        _client = FCSClient(config.FCS_API_BASE_URL, config.FCS_API_KEY)
+    return _client
+
+
+def is_available() -> bool:
+    """Whether the API is configured and its circuit isn't open. Never blocks."""
+    return bool(config.FCS_API_KEY) and get_client().breaker.state != 'open'
+
+
+def bind_loop(loop) -> None:
+    """Run fetches on this event loop (the bot's), reusing its connection pool."""
+    global _bound_loop
+    _bound_loop = loop
+
+
+async def close() -> None:
+    """Close pooled connections (call on shutdown)."""
+    if _client is not None:
+        await _client.aclose()
+
+
+async def _fetch_with_temporary_loop(date_from: str, date_to: str) -> Optional[List[Dict]]:
+    client = get_client()
+    try:
+        return await client.fetch_calendar(date_from, date_to)
+    finally:
+        await client.aclose()
+
+
+def fetch_calendar_blocking(date_from: str, date_to: str) -> Optional[List[Dict]]:
+    """
+    Fetch from synchronous code, e.g. inside database.run_db worker threads.
+
+    With a bound loop the request runs there and only this worker thread
+    waits; before the bot starts, a short-lived loop is used instead.
+
+    Raises:
+        RuntimeError: If called on the bound event loop itself
+    """
+    loop = _bound_loop
+    if loop is not None and loop.is_running():
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("fetch_calendar_blocking called on the event loop; await fetch_calendar instead")
+        future = asyncio.run_coroutine_threadsafe(get_client().fetch_calendar(date_from, date_to), loop)
+        return future.result()
+    return asyncio.run(_fetch_with_temporary_loop(date_from, date_to))
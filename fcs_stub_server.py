@@ -0,0 +1,109 @@
+"""
+Local stand-in for the FCS economic calendar API, for offline testing
+
+Usage:
+    python fcs_stub_server.py [--port 8099] [--fail-rate 0.3] [--latency 2] [--api-error]
+
+Then run the bot with:
+    FCS_API_BASE_URL=http://127.0.0.1:8099/api-v3 FCS_API_KEY=stub
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# (hour, minute, event, currency, impact) repeated every day
+SAMPLE_DAY = [
+    (7, 0, 'UK GDP Growth Rate', 'GBP', 'High'),
+    (9, 0, 'German Ifo Business Climate', 'EUR', 'Medium'),
+    (10, 0, 'Eurozone CPI Flash Estimate', 'EUR', 'High'),
+    (12, 0, 'Japan Household Spending', 'JPY', 'Low'),
+    (13, 30, 'US Unemployment Claims', 'USD', 'Medium'),
+    (15, 0, 'US FOMC Statement', 'USD', 'High'),
+    (21, 45, 'NZ Trade Balance', 'NZD', 'Medium')
+]
+
+
+def build_events(date_from: str, date_to: str):
+    """Sample events for every day in the inclusive range."""
+    day = datetime.strptime(date_from, '%Y-%m-%d')
+    last = datetime.strptime(date_to, '%Y-%m-%d')
+    events = []
+    while day <= last:
+        for hour, minute, title, currency, impact in SAMPLE_DAY:
+            events.append({
+                'date': day.strftime('%Y-%m-%d'),
+                'time': f"{hour:02d}:{minute:02d}:00",
+                'event': title,
+                'country': currency,
+                'impact': impact
+            })
+        day += timedelta(days=1)
+    return events
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    options = None
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/api-v3/forex/economy_cal':
+            self._send_json(404, {'status': False, 'msg': 'Not found'})
+            return
+
+        if self.options.latency:
+            time.sleep(self.options.latency)
+        if random.random() < self.options.fail_rate:
+            self._send_json(503, {'status': False, 'msg': 'Service unavailable (stub)'})
+            return
+        if self.options.api_error:
+            self._send_json(200, {'status': False, 'msg': 'Invalid access key (stub)'})
+            return
+
+        params = parse_qs(url.query)
+        today = datetime.now().strftime('%Y-%m-%d')
+        date_from = params.get('date_from', [today])[0]
+        date_to = params.get('date_to', [date_from])[0]
+        try:
+            events = build_events(date_from, date_to)
+        except ValueError:
+            self._send_json(200, {'status': False, 'msg': 'Invalid date'})
+            return
+        self._send_json(200, {'status': True, 'response': events})
+
+
+def main() -> int:
+    """Parse arguments and serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Stub FCS economic calendar API")
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument('--api-error', action='store_true', help="Answer every request with status=false")
+    StubHandler.options = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', StubHandler.options.port), StubHandler)
+    print(f"🧪 Stub FCS API on http://127.0.0.1:{StubHandler.options.port}/api-v3")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
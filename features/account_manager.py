@@ -3,6 +3,7 @@ Account Manager - Handle user's trading accounts
 """
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
+from database import run_db
 from features import user_manager
 
 
@@ -13,8 +14,8 @@ SELECT_ACCOUNT_ACTION, ADD_ACCOUNT, RENAME_ACCOUNT, SELECT_ACCOUNT_TO_RENAME, SE
 async def manage_accounts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Show account management menu."""
     user_id = update.effective_user.id
-    accounts = user_manager.get_user_accounts(user_id)
-    default_account = user_manager.get_default_account(user_id)
+    accounts = await run_db(user_manager.get_user_accounts, user_id)
+    default_account = await run_db(user_manager.get_default_account, user_id)
     default_id = default_account['id'] if default_account else None
     
     # Create account buttons
@@ -65,12 +66,12 @@ async def view_account_details(update: Update, context: ContextTypes.DEFAULT_TYP
     user_id = update.effective_user.id
     account_id = query.data.replace("view_acc_", "")
     
-    account = user_manager.get_account_by_id(user_id, account_id)
+    account = await run_db(user_manager.get_account_by_id, user_id, account_id)
     if not account:
         await query.message.edit_text("❌ Account not found")
         return ConversationHandler.END
     
-    default_account = user_manager.get_default_account(user_id)
+    default_account = await run_db(user_manager.get_default_account, user_id)
     is_default = default_account and default_account['id'] == account_id
     
     # Create action buttons
@@ -81,7 +82,7 @@ async def view_account_details(update: Update, context: ContextTypes.DEFAULT_TYP
     
     buttons.append([InlineKeyboardButton("✏️ Rename", callback_data=f"rename_acc_{account_id}")])
     
-    accounts = user_manager.get_user_accounts(user_id)
+    accounts = await run_db(user_manager.get_user_accounts, user_id)
     if len(accounts) > 1:  # Don't allow deleting last account
         buttons.append([InlineKeyboardButton("❌ Delete", callback_data=f"delete_acc_{account_id}")])
     
@@ -114,7 +115,7 @@ async def handle_account_action(update: Update, context: ContextTypes.DEFAULT_TY
     
     if data == "add_account":
         # Check account limit (max 3 accounts)
-        accounts = user_manager.get_user_accounts(user_id)
+        accounts = await run_db(user_manager.get_user_accounts, user_id)
         if len(accounts) >= 3:
             await query.message.edit_text(
                 "❌ <b>Account Limit Reached</b>\n\n"
@@ -137,7 +138,7 @@ async def handle_account_action(update: Update, context: ContextTypes.DEFAULT_TY
     
     elif data.startswith("set_default_"):
         account_id = data.replace("set_default_", "")
-        success = user_manager.set_default_account(user_id, account_id)
+        success = await run_db(user_manager.set_default_account, user_id, account_id)
         
         if success:
             await query.message.edit_text(
@@ -169,7 +170,7 @@ async def handle_account_action(update: Update, context: ContextTypes.DEFAULT_TY
     
     elif data.startswith("delete_acc_"):
         account_id = data.replace("delete_acc_", "")
-        success = user_manager.remove_user_account(user_id, account_id)
+        success = await run_db(user_manager.remove_user_account, user_id, account_id)
         
         if success:
             await query.message.edit_text(
@@ -214,7 +215,7 @@ async def receive_new_account(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
         return ADD_ACCOUNT
     
-    account = user_manager.add_user_account(user_id, account_name)
+    account = await run_db(user_manager.add_user_account, user_id, account_name)
     
     await update.message.reply_html(
         f"✅ <b>Created: {account_name}</b>\n"
@@ -242,7 +243,7 @@ async def receive_account_rename(update: Update, context: ContextTypes.DEFAULT_T
         )
         return RENAME_ACCOUNT
     
-    success = user_manager.rename_user_account(user_id, account_id, new_name)
+    success = await run_db(user_manager.rename_user_account, user_id, account_id, new_name)
     
     if success:
         await update.message.reply_html(
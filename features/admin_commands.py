@@ -1,16 +1,51 @@
 """
 Admin commands for managing news events
 """
+from datetime import datetime, timedelta
 from telegram import Update
 from telegram.ext import ContextTypes
 from features import news_rule
+from database import run_db
+import broadcast
+import config
+import dashboard_tokens
+import subscriptions
 import utils
 
 
+def _parse_news_day(args: list):
+    """
+    Resolve /news arguments to a date: none = today, 'tomorrow', or YYYY-MM-DD.
+    
+    Raises:
+        ValueError: If the argument isn't a recognised day
+    """
+    today = utils.get_current_uk_time().date()
+    if not args or args[0].lower() == 'today':
+        return today
+    if args[0].lower() == 'tomorrow':
+        return today + timedelta(days=1)
+    return datetime.strptime(args[0], '%Y-%m-%d').date()
+
+
 async def show_upcoming_news(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Display today's high-impact news events with beautiful formatting."""
+    """
+    Display a day's high-impact news events with beautiful formatting.
+    Format: /news [tomorrow|YYYY-MM-DD] (defaults to today)
+    """
     try:
-        todays_news, api_available = news_rule.get_todays_news()
+        try:
+            news_day = _parse_news_day(context.args)
+        except ValueError:
+            await update.message.reply_html(
+                "❌ <b>Invalid date</b>\n\n"
+                "Usage: <code>/news</code>, <code>/news tomorrow</code> or <code>/news YYYY-MM-DD</code>"
+            )
+            return
+        
+        todays_news, api_available = await run_db(news_rule.get_news_for_date, news_day)
+        is_today = news_day == utils.get_current_uk_time().date()
+        day_label = "Today's" if is_today else news_day.strftime('%a %d %b')
         
         # Check if API is unavailable
         if not api_available:
@@ -21,24 +56,24 @@ async def show_upcoming_news(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             return
         
-        # Check if no events today (but API is working)
+        # Check if no events that day (but API is working)
         if not todays_news:
-            current_date = utils.get_current_uk_time().strftime('%A, %B %d, %Y')
+            current_date = news_day.strftime('%A, %B %d, %Y')
             await update.message.reply_html(
-                f"📰 <b>Today's Economic News</b>\n"
+                f"📰 <b>{day_label} Economic News</b>\n"
                 f"📅 {current_date}\n\n"
-                "✅ <i>No high-impact news events scheduled today</i>\n\n"
+                "✅ <i>No high-impact news events scheduled</i>\n\n"
                 "🟢 Safe to trade without news risk concerns!\n\n"
                 "💡 News updates automatically every 4 hours"
             )
             return
         
-        # Build beautiful message with today's news
-        current_date = utils.get_current_uk_time().strftime('%A, %B %d, %Y')
+        # Build beautiful message with the day's news
+        current_date = news_day.strftime('%A, %B %d, %Y')
         current_time = utils.get_current_uk_time()
         
         message = (
-            f"📰 <b>Today's Economic Calendar</b>\n"
+            f"📰 <b>{day_label} Economic Calendar</b>\n"
             f"📅 {current_date}\n"
             f"━━━━━━━━━━━━━━━━━━━━\n\n"
         )
@@ -128,8 +163,12 @@ async def add_news_event_command(update: Update, context: ContextTypes.DEFAULT_T
         # Get title
         title = ' '.join(context.args[3:])
         
-        # Add to cache
-        news_rule.add_news_event(datetime_str, title, impact=impact)
+        # Add to the shared calendar; only the replica that runs scheduled jobs
+        # sends alerts (the others' events are picked up by its next resync)
+        await run_db(news_rule.add_news_event, datetime_str, title, impact=impact)
+        if config.BOT_SCHEDULED_JOBS:
+            index = await run_db(news_rule.get_news_index)
+            schedule_news_alerts(context.job_queue, context.bot_data, index)
         
         impact_emoji = "🔴" if impact == 'HIGH' else "🟡"
         
@@ -150,87 +189,229 @@ async def add_news_event_command(update: Update, context: ContextTypes.DEFAULT_T
         )
 
 
-async def send_news_alert(context: ContextTypes.DEFAULT_TYPE) -> None:
+def _format_alert_settings(subscription: dict) -> str:
+    """Describe a subscription's alert preferences."""
+    currencies = ', '.join(sorted(subscription['currencies'])) or 'All'
+    impact = 'HIGH only' if subscription['min_impact'] == 'HIGH' else 'HIGH and MEDIUM'
+    if subscription['mute_start_hour'] is None or subscription['mute_end_hour'] is None:
+        mute = 'Off'
+    else:
+        mute = f"{subscription['mute_start_hour']:02d}:00 - {subscription['mute_end_hour']:02d}:00 UK"
+    return (
+        f"💱 Currencies: <code>{currencies}</code>\n"
+        f"⚡ Impact: {impact}\n"
+        f"🌙 Mute hours: {mute}"
+    )
+
+
+async def alert_settings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
-    Background job to check for upcoming news and send alerts.
-    Runs every minute (this is intentional) to catch news 10 minutes before.
-    Only sends alerts when news is actually upcoming.
-    Ensures each news event alert is sent only ONCE.
+    View or change news alert preferences.
+    Format: /alerts [on|off|currencies USD,GBP|currencies all|impact HIGH|MEDIUM|mute 22-7|mute off]
     """
-    upcoming_news = news_rule.get_news_in_10_minutes()
+    chat_id = update.effective_chat.id
+    args = [arg.lower() for arg in context.args or []]
     
-    if not upcoming_news:
-        # No news in the next 10-11 minutes - this is normal, don't log
+    usage = (
+        "Usage:\n"
+        "<code>/alerts</code> - show settings\n"
+        "<code>/alerts on</code> / <code>/alerts off</code>\n"
+        "<code>/alerts currencies USD,GBP</code> (or <code>all</code>)\n"
+        "<code>/alerts impact HIGH</code> (or <code>MEDIUM</code>)\n"
+        "<code>/alerts mute 22-7</code> (or <code>off</code>)"
+    )
+    
+    try:
+        if not args:
+            pass
+        elif args[0] == 'on':
+            await run_db(subscriptions.subscribe, chat_id, update.effective_user.id)
+        elif args[0] == 'off':
+            await run_db(subscriptions.unsubscribe, chat_id)
+            await update.message.reply_html(
+                "🔕 <b>News alerts turned off</b>\n\nUse <code>/alerts on</code> to turn them back on."
+            )
+            return
+        elif subscriptions.get_subscription(chat_id) is None:
+            await update.message.reply_html(
+                "🔕 News alerts are off. Use <code>/alerts on</code> first."
+            )
+            return
+        elif args[0] == 'currencies' and len(args) == 2:
+            currencies = [] if args[1] == 'all' else [c for c in args[1].split(',') if c]
+            if any(len(c) != 3 or not c.isalpha() for c in currencies):
+                raise ValueError("Currencies must be 3-letter codes, e.g. USD,GBP")
+            await run_db(subscriptions.update_preferences, chat_id, currencies=currencies)
+        elif args[0] == 'impact' and len(args) == 2 and args[1].upper() in subscriptions.IMPACT_LEVELS:
+            await run_db(subscriptions.update_preferences, chat_id, min_impact=args[1].upper())
+        elif args[0] == 'mute' and len(args) == 2:
+            if args[1] == 'off':
+                mute_hours = (None, None)
+            else:
+                start, end = (int(h) for h in args[1].split('-'))
+                if not (0 <= start <= 23 and 0 <= end <= 23):
+                    raise ValueError("Hours must be between 0 and 23")
+                mute_hours = (start, end)
+            await run_db(subscriptions.update_preferences, chat_id, mute_hours=mute_hours)
+        else:
+            raise ValueError("Unknown option")
+    except ValueError as e:
+        await update.message.reply_html(f"❌ <b>Invalid alert setting</b>\n\n{e}\n\n{usage}")
         return
     
-    # Initialize alerted events tracker if not exists
-    if 'alerted_news_events' not in context.bot_data:
-        context.bot_data['alerted_news_events'] = set()
+    subscription = subscriptions.get_subscription(chat_id)
+    if subscription is None:
+        await update.message.reply_html(
+            "🔕 <b>News alerts are off</b>\n\nUse <code>/alerts on</code> to turn them on."
+        )
+        return
     
-    # Send alert to all users who have interacted with the bot
-    chat_ids = context.bot_data.get('subscribed_users', set())
+    await update.message.reply_html(
+        "🔔 <b>News Alert Settings</b>\n\n"
+        f"{_format_alert_settings(subscription)}\n\n"
+        f"{usage}"
+    )
+
+
+# Alerts go out this long before each event
+NEWS_ALERT_LEAD = timedelta(minutes=10)
+NEWS_ALERT_JOB_PREFIX = 'news_alert:'
+
+
+def _news_event_id(event: dict) -> str:
+    """Unique identifier for a news event (datetime + currency + title, like news_events' key)."""
+    return f"{event['datetime']}_{news_rule.event_currency(event)}_{event['title']}"
+
+
+def schedule_news_alerts(job_queue, bot_data: dict, index: news_rule.NewsIndex) -> int:
+    """
+    Sync one run_once alert job per upcoming HIGH/MEDIUM news event.
+    Jobs for events that disappeared from the calendar are cancelled;
+    events that already have a job keep it.
     
-    for event in upcoming_news:
-        # Create unique identifier for this event (datetime + title)
-        event_id = f"{event['datetime']}_{event['title']}"
-        
-        # Check if alert already sent for this event
-        if event_id in context.bot_data['alerted_news_events']:
-            # Already alerted, skip
+    Args:
+        job_queue: Application job queue
+        bot_data: Application bot_data (holds the alerted-events set)
+        index: Current news index (load it off the event loop with run_db)
+    
+    Returns:
+        Number of alert jobs now scheduled
+    """
+    now = utils.get_current_uk_time()
+    alerted = bot_data.setdefault('alerted_news_events', set())
+    
+    upcoming_ids = set()
+    wanted = {}
+    for event in index.alert_events:
+        try:
+            event_time = utils.parse_datetime(event['datetime'])
+        except (KeyError, ValueError):
             continue
-        
-        # Mark as alerted
-        context.bot_data['alerted_news_events'].add(event_id)
-        
-        impact_emoji = "🔴" if event.get('impact') == 'HIGH' else "🟡"
-        time_str = utils.format_display_datetime(event['datetime'])
-        
-        alert_message = (
-            f"⚠️ <b>NEWS ALERT</b> ⚠️\n\n"
-            f"{impact_emoji} <b>{event['title']}</b>\n"
-            f"📅 Time: {time_str}\n"
-            f"⏰ In: <b>~10 minutes</b>\n"
-        )
-        
-        if event.get('currency'):
-            alert_message += f"💱 Currency: {event['currency']}\n"
-        
-        alert_message += f"\n⚡ Impact: <b>{event.get('impact', 'HIGH')}</b>"
-        
-        for chat_id in chat_ids:
-            try:
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=alert_message,
-                    parse_mode='HTML'
-                )
-            except Exception as e:
-                print(f"Failed to send alert to {chat_id}: {e}")
-        
-        print(f"✅ Alert sent for: {event['title']} at {event['datetime']}")
+        if event_time <= now:
+            continue
+        event_id = _news_event_id(event)
+        upcoming_ids.add(event_id)
+        if event_id in alerted:
+            continue
+        # Events less than a minute past their alert time still get one, immediately
+        alert_time = event_time - NEWS_ALERT_LEAD
+        if alert_time < now - timedelta(minutes=1):
+            continue
+        wanted[NEWS_ALERT_JOB_PREFIX + event_id] = (max(alert_time, now), event)
+    
+    # Dedupe state only needs events that haven't happened yet
+    alerted.intersection_update(upcoming_ids)
+    
+    for job in job_queue.jobs():
+        if job.name and job.name.startswith(NEWS_ALERT_JOB_PREFIX) and job.name not in wanted:
+            job.schedule_removal()
+    
+    scheduled = {job.name for job in job_queue.jobs() if job.name in wanted}
+    for name, (when, event) in wanted.items():
+        if name not in scheduled:
+            job_queue.run_once(send_news_alert, when=when, data=event, name=name)
+    
+    return len(wanted)
+
+
+async def broadcast_to_subscribers(context: ContextTypes.DEFAULT_TYPE, chat_ids: list,
+                                   message: str, name: str) -> dict:
+    """
+    Send an HTML message to the given subscribers and unsubscribe chats that blocked the bot.
+    
+    Returns:
+        Broadcast delivery report
+    """
+    report = await broadcast.send_broadcast(
+        context.bot, chat_ids, message, name=name, parse_mode='HTML'
+    )
+    for chat_id in report['blocked']:
+        await run_db(subscriptions.unsubscribe, chat_id)
+    if report['blocked']:
+        print(f"🧹 Unsubscribed {len(report['blocked'])} chat(s) that blocked the bot")
+    return report
+
+
+async def schedule_news_alerts_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Background job wrapper around schedule_news_alerts (startup and periodic resync)."""
+    index = await run_db(news_rule.get_news_index)
+    count = schedule_news_alerts(context.job_queue, context.bot_data, index)
+    print(f"🔔 {count} news alert(s) scheduled")
+
+
+async def send_news_alert(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    One-shot job that alerts subscribers ~10 minutes before a news event.
+    Scheduled per event by schedule_news_alerts; each event alerts only ONCE.
+    """
+    event = context.job.data
+    event_id = _news_event_id(event)
+    
+    alerted = context.bot_data.setdefault('alerted_news_events', set())
+    if event_id in alerted:
+        return
+    alerted.add(event_id)
+    
+    impact_emoji = "🔴" if event.get('impact') == 'HIGH' else "🟡"
+    time_str = utils.format_display_datetime(event['datetime'])
+    
+    alert_message = (
+        f"⚠️ <b>NEWS ALERT</b> ⚠️\n\n"
+        f"{impact_emoji} <b>{event['title']}</b>\n"
+        f"📅 Time: {time_str}\n"
+        f"⏰ In: <b>~10 minutes</b>\n"
+    )
+    
+    if event.get('currency'):
+        alert_message += f"💱 Currency: {event['currency']}\n"
+    
+    alert_message += f"\n⚡ Impact: <b>{event.get('impact', 'HIGH')}</b>"
+    
+    # /alerts changes made on other replicas only reach this index via the table
+    await run_db(subscriptions.load_subscriptions)
+    # Only subscribers who want this currency/impact and aren't muted right now
+    chat_ids = subscriptions.select_recipients(
+        news_rule.event_currency(event), event.get('impact', 'HIGH'), utils.get_current_uk_time()
+    )
+    await broadcast_to_subscribers(context, chat_ids, alert_message, name=f"news alert {event_id}")
+    print(f"✅ Alert sent for: {event['title']} at {event['datetime']}")
 
 
 async def refresh_news_cache_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Background job to refresh news cache every 4 hours.
-    Ensures we always have up-to-date news data.
-    Also cleans up old alerted events from memory.
+    Ensures we always have up-to-date news data and reschedules alerts.
     """
     try:
         print("🔄 Running scheduled news refresh...")
-        count = news_rule.refresh_daily_news()
+        count = await run_db(news_rule.refresh_daily_news)
         if count > 0:
             print(f"✅ News cache refreshed: {count} events loaded")
         else:
             print("ℹ️ News cache refreshed: No events today")
         
-        # Clean up old alerted events (older than 2 hours)
-        if 'alerted_news_events' in context.bot_data:
-            old_count = len(context.bot_data['alerted_news_events'])
-            # Clear all old alerts on refresh (they're already past)
-            context.bot_data['alerted_news_events'].clear()
-            if old_count > 0:
-                print(f"🧹 Cleared {old_count} old alert records")
+        index = await run_db(news_rule.get_news_index)
+        schedule_news_alerts(context.job_queue, context.bot_data, index)
     except Exception as e:
         print(f"❌ Failed to refresh news cache: {e}")
 
@@ -241,8 +422,11 @@ async def send_daily_news_summary(context: ContextTypes.DEFAULT_TYPE) -> None:
     Called daily after news fetch.
     """
     # Refresh news first
-    all_news = news_rule.refresh_daily_news()
+    await run_db(news_rule.refresh_daily_news)
+    index = await run_db(news_rule.get_news_index)
+    schedule_news_alerts(context.job_queue, context.bot_data, index)
     
+    all_news, _ = await run_db(news_rule.get_todays_news)
     if not all_news:
         return
     
@@ -287,39 +471,19 @@ async def send_daily_news_summary(context: ContextTypes.DEFAULT_TYPE) -> None:
         "🛡️ Trades during ±10 min windows will be flagged"
     )
     
-    # Send to all subscribed users
-    chat_ids = context.bot_data.get('subscribed_users', set())
-    for chat_id in chat_ids:
-        try:
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
-        except Exception as e:
-            print(f"Failed to send daily summary to {chat_id}: {e}")
+    # Send to all subscribed users (reloaded: /alerts may have run on another replica)
+    await run_db(subscriptions.load_subscriptions)
+    chat_ids = subscriptions.all_recipients(utils.get_current_uk_time())
+    await broadcast_to_subscribers(context, chat_ids, message, name='daily news summary')
 
 
 async def generate_dashboard_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Generate a secure dashboard link for the user."""
     try:
-        import web_server
-        import config
-        
         user_id = update.effective_user.id
         
-        # Check if user already has a valid token
-        is_reused = False
-        if user_id in web_server.user_tokens:
-            existing_token = web_server.user_tokens[user_id]
-            if existing_token in web_server.active_tokens:
-                token_data = web_server.active_tokens[existing_token]
-                from datetime import datetime, timedelta
-                if datetime.now() + timedelta(hours=1) < token_data['expires']:
-                    is_reused = True
-        
-        # Generate or reuse token
-        token = web_server.generate_dashboard_token(user_id, expires_hours=24)
+        # Generate or reuse token (shared store, so any web worker can verify it)
+        token, is_reused = await run_db(dashboard_tokens.issue_token, user_id, 24)
         
         # Get base URL from environment
         import os
@@ -2,356 +2,553 @@
 News rule module - Detect high-impact news and flag trades
 Fetches daily news events and sends notifications 10 minutes before
 """
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from bisect import bisect_left
+from functools import lru_cache
 import json
 import os
-from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
+import re
+import tempfile
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+from database import get_db_connection
 import config
+import fcs_client
 import utils
 
 
+# Impact levels that count towards trade risk and alerts
+ALERT_IMPACTS = ('HIGH', 'MEDIUM')
+
+# Currencies whose releases can move a pair
+KNOWN_CURRENCIES = {
+    'USD', 'EUR', 'GBP', 'JPY', 'CHF', 'CAD', 'AUD', 'NZD', 'CNY', 'CNH',
+    'HKD', 'SGD', 'SEK', 'NOK', 'DKK', 'PLN', 'HUF', 'CZK', 'TRY', 'ZAR',
+    'MXN', 'BRL', 'INR', 'KRW', 'RUB'
+}
+
+# Calendar feeds sometimes give a country code instead of a currency
+COUNTRY_CURRENCIES = {
+    'US': 'USD', 'UK': 'GBP', 'GB': 'GBP', 'EU': 'EUR', 'EZ': 'EUR', 'DE': 'EUR',
+    'FR': 'EUR', 'IT': 'EUR', 'ES': 'EUR', 'JP': 'JPY', 'CH': 'CHF', 'CA': 'CAD',
+    'AU': 'AUD', 'NZ': 'NZD', 'CN': 'CNY', 'HK': 'HKD', 'SG': 'SGD', 'SE': 'SEK',
+    'NO': 'NOK', 'ZA': 'ZAR', 'MX': 'MXN', 'TR': 'TRY', 'IN': 'INR', 'KR': 'KRW'
+}
+
+# Symbols that aren't two currency codes glued together
+SYMBOL_CURRENCIES = {
+    'XAU': 'USD', 'XAG': 'USD', 'XPT': 'USD', 'XPD': 'USD',  # Metals are priced in USD
+    'US30': 'USD', 'US100': 'USD', 'NAS100': 'USD', 'US500': 'USD', 'SPX500': 'USD',
+    'USOIL': 'USD', 'WTI': 'USD', 'UKOIL': 'USD', 'BRENT': 'USD', 'DXY': 'USD',
+    'UK100': 'GBP', 'GER40': 'EUR', 'DE40': 'EUR', 'GER30': 'EUR', 'EU50': 'EUR',
+    'FRA40': 'EUR', 'JP225': 'JPY', 'JPN225': 'JPY', 'AUS200': 'AUD', 'HK50': 'HKD'
+}
+
+# Stablecoin quotes behave like USD for news purposes
+STABLECOIN_QUOTES = ('USDT', 'USDC', 'BUSD')
+
+
+def event_currency(event: Dict) -> str:
+    """
+    Normalised currency code of a news event.
+    
+    Returns:
+        Currency code, or '' if the event's currency is unknown
+    """
+    raw = str(event.get('currency') or '').strip().upper()
+    if raw in KNOWN_CURRENCIES:
+        return raw
+    return COUNTRY_CURRENCIES.get(raw, '')
+
+
+@lru_cache(maxsize=1024)
+def pair_currencies(pair: str) -> frozenset:
+    """
+    Currencies whose news affects a pair, e.g. EURUSD -> {EUR, USD},
+    XAUUSD -> {USD}, BTCUSDT -> {USD}, GER40 -> {EUR}.
+    
+    Args:
+        pair: Pair or symbol name
+    
+    Returns:
+        Set of currency codes (empty if the symbol isn't recognised)
+    """
+    symbol = re.sub(r'[^A-Z0-9]', '', (pair or '').upper())
+    if symbol in SYMBOL_CURRENCIES:
+        return frozenset({SYMBOL_CURRENCIES[symbol]})
+    
+    currencies = set()
+    for quote in STABLECOIN_QUOTES:
+        if symbol.endswith(quote):
+            currencies.add('USD')
+            symbol = symbol[:-len(quote)]
+            break
+    
+    for part in (symbol[:3], symbol[3:6]) if len(symbol) == 6 else (symbol,):
+        if part in KNOWN_CURRENCIES:
+            currencies.add(part)
+        elif part in SYMBOL_CURRENCIES:
+            currencies.add(SYMBOL_CURRENCIES[part])
+    return frozenset(currencies)
+
+
+class NewsIndex:
+    """
+    Parsed, time-sorted view of the news cache.
+    
+    Event datetimes are parsed once; lookups bisect the sorted epoch
+    timestamps instead of re-parsing every event on every call.
+    """
+    
+    def __init__(self, cache_data: Dict, stamp: Optional[Tuple] = None):
+        self.stamp = stamp
+        self.generation = cache_data.get('generation')
+        self.last_updated = cache_data.get('last_updated')
+        self.fetched_days = cache_data.get('fetched_days', {})
+        
+        parsed = []
+        for event in cache_data.get('news', []):
+            try:
+                parsed.append((utils.parse_datetime(event['datetime']).timestamp(), event))
+            except (KeyError, ValueError, TypeError):
+                continue
+        parsed.sort(key=lambda item: item[0])
+        
+        self.events = [event for _, event in parsed]
+        self.timestamps = [ts for ts, _ in parsed]
+        
+        alerts = [(ts, event) for ts, event in parsed if event.get('impact') in ALERT_IMPACTS]
+        self.alert_events = [event for _, event in alerts]
+        self.alert_timestamps = [ts for ts, _ in alerts]
+        
+        # Per-currency sorted alert timestamps; '' holds events with unknown currency
+        self.alert_timestamps_by_currency: Dict[str, List[float]] = {}
+        for ts, event in alerts:
+            self.alert_timestamps_by_currency.setdefault(event_currency(event), []).append(ts)
+    
+    def events_between(self, start: datetime, end: datetime) -> List[Dict]:
+        """All events with start <= time < end."""
+        lo = bisect_left(self.timestamps, start.timestamp())
+        hi = bisect_left(self.timestamps, end.timestamp())
+        return self.events[lo:hi]
+    
+    def alert_events_between(self, start: datetime, end: datetime) -> List[Dict]:
+        """HIGH/MEDIUM impact events with start <= time < end."""
+        lo = bisect_left(self.alert_timestamps, start.timestamp())
+        hi = bisect_left(self.alert_timestamps, end.timestamp())
+        return self.alert_events[lo:hi]
+    
+    def has_alert_event_within(self, moment: datetime, window_minutes: float,
+                               currencies: Optional[frozenset] = None) -> bool:
+        """
+        Whether a HIGH/MEDIUM impact event lies within ±window_minutes of moment.
+        With currencies, only events for those currencies (or of unknown
+        currency) count.
+        """
+        ts = moment.timestamp()
+        window = window_minutes * 60
+        
+        if currencies:
+            arrays = [self.alert_timestamps_by_currency.get(c, []) for c in currencies]
+            arrays.append(self.alert_timestamps_by_currency.get('', []))
+        else:
+            arrays = [self.alert_timestamps]
+        
+        for timestamps in arrays:
+            i = bisect_left(timestamps, ts - window)
+            if i < len(timestamps) and timestamps[i] <= ts + window:
+                return True
+        return False
+
+
+_index_lock = threading.Lock()
+_index: Optional[NewsIndex] = None
+_index_checked_at = 0.0  # time.monotonic() when _index was last validated against the database
+
+# Named lock so only one worker/replica fetches from the API at a time
+NEWS_REFRESH_LOCK_NAME = 'trading_journal_news_refresh'
+
+
+def _db_stamp(cursor) -> Tuple:
+    """Cheap fingerprint of the news tables; changes whenever their contents do."""
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM news_events) AS event_count,
+               (SELECT MAX(updated_at) FROM news_events) AS events_updated,
+               (SELECT MAX(fetched_at) FROM news_calendar_days) AS last_fetch
+    """)
+    row = cursor.fetchone()
+    return (row['event_count'], row['events_updated'], row['last_fetch'])
+
+
+def _read_calendar(cursor) -> Dict:
+    """Read every stored event and fetched day, in the same shape as the local snapshot."""
+    cursor.execute("""
+        SELECT event_datetime, currency, title, impact, source
+        FROM news_events
+        ORDER BY event_datetime
+    """)
+    news_events = [
+        {
+            'datetime': utils.format_datetime(row['event_datetime']),
+            'title': row['title'],
+            'currency': row['currency'],
+            'impact': row['impact'],
+            'source': row['source']
+        }
+        for row in cursor.fetchall()
+    ]
+    
+    cursor.execute("SELECT day, fetched_at FROM news_calendar_days")
+    fetched_days = {
+        row['day'].strftime('%Y-%m-%d'): utils.format_datetime(row['fetched_at'])
+        for row in cursor.fetchall()
+    }
+    
+    return {
+        'last_updated': max(fetched_days.values()) if fetched_days else None,
+        'fetched_days': fetched_days,
+        'news': news_events
+    }
+
+
+def _set_index(index: NewsIndex) -> NewsIndex:
+    global _index, _index_checked_at
+    with _index_lock:
+        _index = index
+        _index_checked_at = time.monotonic()
+    return index
+
+
+def invalidate_news_index() -> None:
+    """Force the next lookup to revalidate against the database (call after writes)."""
+    global _index_checked_at
+    with _index_lock:
+        _index_checked_at = 0.0
+
+
+def get_news_index() -> NewsIndex:
+    """
+    Get the process-wide news index (read-through cache over the news tables).
+    
+    The index is revalidated at most every NEWS_INDEX_TTL_SECONDS with one
+    cheap query and only reloaded when the tables changed. If the database is
+    unreachable, the last local snapshot is served.
+    
+    Returns:
+        Current NewsIndex
+    """
+    index = _index
+    if index is not None and time.monotonic() - _index_checked_at < config.NEWS_INDEX_TTL_SECONDS:
+        return index
+    
+    try:
+        with get_db_connection() as cursor:
+            stamp = _db_stamp(cursor)
+            if index is not None and index.stamp == stamp:
+                return _set_index(index)
+            cache_data = _read_calendar(cursor)
+    except Exception as e:
+        print(f"⚠️ News database unavailable, using local snapshot: {e}")
+        snapshot = load_news_cache()
+        if index is None or index.generation != snapshot['generation']:
+            index = NewsIndex(snapshot)
+        # Back off for a full TTL rather than retrying on every lookup
+        return _set_index(index)
+    
+    cache_data['generation'] = save_news_cache(
+        cache_data['news'], cache_data['last_updated'],
+        api_available=fcs_client.is_available(), fetched_days=cache_data['fetched_days']
+    )
+    return _set_index(NewsIndex(cache_data, stamp))
+
+
+_snapshot_lock = threading.Lock()
+_snapshot_stamp: Optional[Tuple] = None  # (inode, mtime_ns, size) of the last parsed snapshot
+_snapshot_data: Optional[Dict] = None
+
+
+def _snapshot_file_stamp() -> Optional[Tuple]:
+    """Identity of the current snapshot file; os.replace gives every write a new inode."""
+    try:
+        st = os.stat(config.NEWS_CACHE_PATH)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def load_news_cache() -> Dict:
     """
-    Load cached news data from JSON file.
+    Load the local news snapshot (fallback when the database is unreachable).
+    
+    The parsed snapshot is kept in memory and only re-parsed when the file
+    has been replaced.
     
     Returns:
-        Dictionary with last_updated and news list
+        Dictionary with generation, last_updated, fetched_days and news list
     """
-    if not os.path.exists(config.NEWS_CACHE_PATH):
-        return {'last_updated': None, 'news': []}
+    global _snapshot_stamp, _snapshot_data
+    stamp = _snapshot_file_stamp()
+    if stamp is None:
+        return {'generation': 0, 'last_updated': None, 'news': []}
+    
+    with _snapshot_lock:
+        if stamp == _snapshot_stamp and _snapshot_data is not None:
+            return _snapshot_data
+        try:
+            with open(config.NEWS_CACHE_PATH, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            # Writes are atomic, so this is real corruption - keep the last good copy
+            print(f"⚠️ Unreadable news snapshot: {e}")
+            return _snapshot_data or {'generation': 0, 'last_updated': None, 'news': []}
+        data.setdefault('generation', 0)
+        _snapshot_stamp, _snapshot_data = stamp, data
+        return data
+
+
+def _write_file_atomically(path: str, payload: bytes) -> None:
+    """Write to a temp file in the same directory, fsync it, then rename over path."""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.news_cache.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
     
+    # Persist the rename itself (not supported on every platform)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
     try:
-        with open(config.NEWS_CACHE_PATH, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {'last_updated': None, 'news': []}
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
 
 
-def save_news_cache(news_events: List[Dict], last_updated: str = None, api_available: bool = True) -> None:
+def save_news_cache(news_events: List[Dict], last_updated: str = None, api_available: bool = True,
+                    fetched_days: Optional[Dict[str, str]] = None) -> int:
     """
-    Save news data to cache file.
+    Save the local news snapshot.
+    
+    The file is replaced atomically, so concurrent readers see either the old
+    or the new snapshot, never a partial one.
     
     Args:
         news_events: List of news event dictionaries
         last_updated: Optional timestamp, defaults to current time
         api_available: Whether the API is available and working
+        fetched_days: Map of 'YYYY-MM-DD' -> when that day was last fetched from the API
+    
+    Returns:
+        Generation number of the written snapshot (0 if it couldn't be written)
     """
+    global _snapshot_stamp, _snapshot_data
     os.makedirs(os.path.dirname(config.NEWS_CACHE_PATH), exist_ok=True)
     
     if last_updated is None:
         last_updated = utils.get_current_datetime_string()
     
+    with _snapshot_lock:
+        previous = _snapshot_data
+    if previous is None:
+        previous = load_news_cache()
+    
     cache_data = {
+        'generation': previous.get('generation', 0) + 1,
         'last_updated': last_updated,
         'api_available': api_available,
+        'fetched_days': fetched_days or {},
         'news': news_events
     }
     
-    with open(config.NEWS_CACHE_PATH, 'w') as f:
-        json.dump(cache_data, f, indent=2)
+    try:
+        payload = json.dumps(cache_data, separators=(',', ':')).encode('utf-8')
+        _write_file_atomically(config.NEWS_CACHE_PATH, payload)
+    except (IOError, OSError) as e:
+        print(f"⚠️ Could not write news snapshot: {e}")
+        return 0
+    
+    with _snapshot_lock:
+        _snapshot_stamp, _snapshot_data = _snapshot_file_stamp(), cache_data
+    return cache_data['generation']
+
+
+def _upsert_events(cursor, news_events: List[Dict], source: str) -> None:
+    """Insert events, updating impact when (datetime, currency, title) already exists."""
+    rows = []
+    for event in news_events:
+        try:
+            event_dt = datetime.strptime(event['datetime'], '%Y-%m-%d %H:%M:%S')
+        except (KeyError, ValueError):
+            continue
+        rows.append((event_dt, event_currency(event), event['title'][:255], event.get('impact', 'HIGH'), source))
+    
+    if rows:
+        cursor.executemany("""
+            INSERT INTO news_events (event_datetime, currency, title, impact, source)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE impact = VALUES(impact)
+        """, rows)
 
 
-def fetch_fcs_api_news(date_str: str) -> List[Dict]:
+def parse_fcs_events(raw_events: List[Dict]) -> List[Dict]:
     """
-    Fetch news from FCS API economic calendar.
-    
-    Args:
-        date_str: Date string in format 'YYYY-MM-DD'
-    
-    Returns:
-        List of news event dictionaries (empty list if no events, None if API error)
+    Convert raw FCS economy_cal events to our news event format,
+    keeping HIGH and MEDIUM impact only.
     """
-    if not config.FCS_API_KEY:
-        print("⚠️ FCS_API_KEY not set")
-        return None  # Return None to indicate API unavailable
-    
-    url = "https://fcsapi.com/api-v3/forex/economy_cal"
-    params = {
-        'access_key': config.FCS_API_KEY,
-        'date_from': date_str,
-        'date_to': date_str
-    }
-    
-    try:
-        print(f"🔄 Fetching news from FCS API for {date_str}...")
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data.get('status') != True:
-            print(f"❌ FCS API Error: {data.get('msg', 'Unknown error')}")
-            return None  # API error
+    news_events = []
+    for event in raw_events:
+        # Filter for HIGH and MEDIUM impact only
+        impact = (event.get('impact') or '').upper()
+        if impact not in ['HIGH', 'MEDIUM']:
+            continue
         
-        news_events = []
-        raw_events = data.get('response', [])
-        print(f"📊 FCS API returned {len(raw_events)} total events")
+        # Combine date and time
+        datetime_str = f"{event.get('date', '')} {event.get('time', '')}"
         
-        for event in raw_events:
-            # Parse FCS API response (economy_cal endpoint)
-            # Filter for HIGH and MEDIUM impact only
-            impact = event.get('impact', '').upper()
-            if impact not in ['HIGH', 'MEDIUM']:
-                continue
-            
-            event_date = event.get('date', '')
-            event_time = event.get('time', '')
-            
-            # Combine date and time
-            datetime_str = f"{event_date} {event_time}"
-            
-            # Convert to our format
-            try:
-                event_dt = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-                formatted_datetime = utils.format_datetime(event_dt)
-            except ValueError:
-                print(f"⚠️ Invalid datetime format: {datetime_str}")
-                continue
-            
-            news_events.append({
-                'datetime': formatted_datetime,
-                'title': event.get('event', event.get('title', 'Unknown Event')),
-                'currency': event.get('country', 'USD'),
-                'impact': impact
-            })
-        
-        print(f"✅ Fetched {len(news_events)} high/medium impact events from FCS API for {date_str}")
-        return news_events  # Return empty list if no events (valid response)
+        # Convert to our format
+        try:
+            event_dt = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
+            formatted_datetime = utils.format_datetime(event_dt)
+        except ValueError:
+            print(f"⚠️ Invalid datetime format: {datetime_str}")
+            continue
         
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error fetching from FCS API: {e}")
-        return None  # API error
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return None  # API error
+        news_events.append({
+            'datetime': formatted_datetime,
+            'title': event.get('event', event.get('title', 'Unknown Event')),
+            'currency': event.get('country', 'USD'),
+            'impact': impact
+        })
+    return news_events
 
 
-def fetch_daily_news() -> List[Dict]:
+def fetch_fcs_api_news(date_str: str, date_to: Optional[str] = None) -> List[Dict]:
     """
-    Fetch HIGH and MEDIUM impact news for today only from FCS API.
-    Returns None if API fails, empty list if no events today.
-    
-    Returns:
-        List of news event dictionaries, empty list if no events, None if API error
-    """
-    if not config.FCS_API_KEY:
-        print("⚠️ FCS_API_KEY not set")
-        return None  # API unavailable
-    
-    current_date = utils.get_current_uk_time().date()
-    date_str = current_date.strftime('%Y-%m-%d')
+    Fetch news from FCS API economic calendar.
     
-    # Fetch only today's news from FCS API
-    fcs_news = fetch_fcs_api_news(date_str)
-    
-    if fcs_news is None:
-        # API error
-        print(f"❌ API failed for {date_str}")
-        return None
-    elif len(fcs_news) == 0:
-        # API worked but no events today
-        print(f"✅ API successful but no high/medium impact events today ({date_str})")
-        return []
-    else:
-        # Got events
-        print(f"✅ Fetched {len(fcs_news)} events for today from FCS API")
-        return fcs_news
-
-
-def generate_sample_news_for_date(base_date: datetime) -> List[Dict]:
-    """
-    Generate sample news events for testing.
+    Blocking wrapper for worker threads: the HTTP request itself runs on the
+    async FCS client (pooled connections, retries, circuit breaker).
     
     Args:
-        base_date: Base datetime to generate news around
+        date_str: Date string in format 'YYYY-MM-DD'
+        date_to: Optional inclusive end date for a multi-day fetch (defaults to date_str)
     
     Returns:
-        List of sample news event dictionaries
+        List of news event dictionaries (empty list if no events, None if API error)
     """
-    base_time = base_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    date_to = date_to or date_str
+    if not config.FCS_API_KEY:
+        print("⚠️ FCS_API_KEY not set")
+        return None  # Return None to indicate API unavailable
     
-    sample_events = [
-        {
-            'datetime': utils.format_datetime(base_time + timedelta(hours=7, minutes=0)),
-            'title': 'UK GDP Growth Rate',
-            'currency': 'GBP',
-            'impact': 'HIGH'
-        },
-        {
-            'datetime': utils.format_datetime(base_time + timedelta(hours=13, minutes=30)),
-            'title': 'US Unemployment Claims',
-            'currency': 'USD',
-            'impact': 'MEDIUM'
-        },
-        {
-            'datetime': utils.format_datetime(base_time + timedelta(hours=15, minutes=0)),
-            'title': 'US FOMC Statement',
-            'currency': 'USD',
-            'impact': 'HIGH'
-        }
-    ]
+    print(f"🔄 Fetching news from FCS API for {date_str} to {date_to}...")
+    raw_events = fcs_client.fetch_calendar_blocking(date_str, date_to)
+    if raw_events is None:
+        return None  # API error
     
-    return sample_events
+    print(f"📊 FCS API returned {len(raw_events)} total events")
+    news_events = parse_fcs_events(raw_events)
+    print(f"✅ Fetched {len(news_events)} high/medium impact events from FCS API for {date_str} to {date_to}")
+    return news_events  # Return empty list if no events (valid response)
 
 
 def init_sample_news() -> None:
-    """Initialize news cache by fetching real data from API."""
+    """Initialize the news calendar on startup (fetching from the API if it's due)."""
     try:
-        print("🔄 Initializing news cache with real API data...")
+        print("🔄 Initializing news calendar...")
         
         if not config.FCS_API_KEY:
-            print("⚠️ FCS_API_KEY not set - News feature disabled")
-            save_news_cache([], api_available=False)
+            print("⚠️ FCS_API_KEY not set - serving stored news only")
+            get_news_index()
             return
         
-        # Fetch real news from API
-        all_news = fetch_daily_news()
-        
-        if all_news is None:
-            # API error
-            print("⚠️ API error - News feature unavailable")
-            save_news_cache([], api_available=False)
-            return
-        elif len(all_news) == 0:
-            # API worked but no events
-            print("✅ API working but no high/medium impact events scheduled for today")
-            save_news_cache([], api_available=True)
-            return
-        else:
-            # Got events
-            save_news_cache(all_news, api_available=True)
-            print(f"✅ Initialized {len(all_news)} real news events from API")
+        count = refresh_daily_news()
+        print(f"✅ Initialized news calendar ({count} events today)")
     except Exception as e:
         print(f"❌ Error in init_sample_news: {e}")
-        save_news_cache([], api_available=False)
 
 
-def check_news_risk(trade_time: datetime) -> str:
+def check_news_risk(trade_time: datetime, pair: Optional[str] = None) -> str:
     """
     Check if a trade time is within the news risk window.
-    Only checks for HIGH and MEDIUM impact news.
+    Only checks for HIGH and MEDIUM impact news, and when a pair is given
+    only news for that pair's currencies.
     
     Args:
         trade_time: The datetime when the trade was/will be placed
+        pair: Traded pair (e.g. 'EURUSD'); unrecognised pairs check all news
     
     Returns:
         'HIGH' if within risk window of HIGH/MEDIUM impact news, 'LOW' otherwise
     """
-    cache_data = load_news_cache()
-    news_events = cache_data.get('news', [])
-    
-    risk_window_minutes = config.NEWS_RISK_WINDOW_MINUTES
-    
-    for event in news_events:
-        try:
-            # Skip LOW impact news
-            if event.get('impact') not in ['HIGH', 'MEDIUM']:
-                continue
-            
-            event_time = utils.parse_datetime(event['datetime'])
-            time_diff = abs((trade_time - event_time).total_seconds() / 60)
-            
-            if time_diff <= risk_window_minutes:
-                return 'HIGH'
-        except (KeyError, ValueError):
-            continue
-    
+    index = get_news_index()
+    currencies = pair_currencies(pair) if pair else None
+    if index.has_alert_event_within(trade_time, config.NEWS_RISK_WINDOW_MINUTES, currencies):
+        return 'HIGH'
     return 'LOW'
 
 
-def get_todays_news() -> tuple:
+def get_news_for_date(day: date) -> tuple:
     """
-    Get all news events for today only.
+    Get all news events for one calendar day (UK time) from the cache.
+    
+    Args:
+        day: Date to look up
     
     Returns:
         Tuple of (events_list, api_available_bool)
-        - (None, False) if API is unavailable/error
-        - ([], True) if API working but no events today
-        - ([events], True) if API working and has events
+        - (None, False) if the day has never been fetched and has no events
+        - ([], True) if there are no events that day
+        - ([events], True) if there are events that day
     """
-    cache_data = load_news_cache()
-    api_available = cache_data.get('api_available', True)  # Default to True for old caches
-    news_events = cache_data.get('news', [])
-    
-    # Check if API is unavailable
-    if not api_available:
-        print("⚠️ API marked as unavailable in cache")
-        return (None, False)
+    index = get_news_index()
+    day_str = day.strftime('%Y-%m-%d')
     
-    # API is available
-    if not news_events:
-        print("ℹ️ No news events in cache but API is available")
-        return ([], True)  # No events today
+    day_start = config.TIMEZONE.localize(datetime(day.year, day.month, day.day))
+    day_end = config.TIMEZONE.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
     
-    current_time = utils.get_current_uk_time()
-    today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
-    
-    print(f"📅 Getting today's news: {today_start.strftime('%Y-%m-%d')}")
-    print(f"📰 Total events in cache: {len(news_events)}")
-    
-    todays_events = []
-    for event in news_events:
-        try:
-            event_time = utils.parse_datetime(event['datetime'])
-            if today_start <= event_time < today_end:
-                todays_events.append(event)
-                print(f"✅ Today's event: {event['title']} at {event['datetime']}")
-        except (KeyError, ValueError) as e:
-            print(f"❌ Error parsing event: {e}")
-            continue
+    events = index.events_between(day_start, day_end)
+    if not events and day_str not in index.fetched_days:
+        print(f"⚠️ No calendar data for {day_str}")
+        return (None, False)
     
-    print(f"🔍 Found {len(todays_events)} events for today")
+    print(f"🔍 Found {len(events)} events for {day_str} ({len(index.events)} in cache)")
     
-    # Sort by datetime
-    todays_events.sort(key=lambda x: x['datetime'])
-    return (todays_events, True)
+    # Already sorted by datetime
+    return (list(events), True)
 
 
-def get_news_in_10_minutes() -> List[Dict]:
+def get_todays_news() -> tuple:
     """
-    Get news events that will occur in 10-11 minutes.
-    This is used by the alert system to notify users.
+    Get all news events for today only.
     
     Returns:
-        List of news events happening in 10-11 minutes
+        Tuple of (events_list, api_available_bool), see get_news_for_date
     """
-    cache_data = load_news_cache()
-    news_events = cache_data.get('news', [])
-    
-    if not news_events:
-        return []
-    
-    current_time = utils.get_current_uk_time()
-    min_time = current_time + timedelta(minutes=10)
-    max_time = current_time + timedelta(minutes=11)
-    
-    alert_events = []
-    for event in news_events:
-        try:
-            # Only alert for HIGH and MEDIUM impact
-            if event.get('impact') not in ['HIGH', 'MEDIUM']:
-                continue
-            
-            event_time = utils.parse_datetime(event['datetime'])
-            if min_time <= event_time < max_time:
-                alert_events.append(event)
-        except (KeyError, ValueError):
-            continue
-    
-    return alert_events
+    return get_news_for_date(utils.get_current_uk_time().date())
 
 
-def add_news_event(datetime_str: str, title: str, currency: str, impact: str) -> bool:
+def add_news_event(datetime_str: str, title: str, currency: str = '', impact: str = 'HIGH') -> bool:
     """
-    Manually add a news event to the cache.
+    Manually add a news event to the calendar.
     
     Args:
         datetime_str: Event datetime string
         title: News event title
-        currency: Currency affected (e.g., 'USD', 'GBP')
+        currency: Currency affected (e.g., 'USD', 'GBP'); empty affects every pair
         impact: Impact level ('HIGH' or 'MEDIUM')
     
     Returns:
@@ -365,12 +562,6 @@ def add_news_event(datetime_str: str, title: str, currency: str, impact: str) ->
         if impact not in ['HIGH', 'MEDIUM']:
             return False
         
-        # Load current cache
-        cache_data = load_news_cache()
-        news_events = cache_data.get('news', [])
-        api_available = cache_data.get('api_available', True)
-        
-        # Create new event
         new_event = {
             'datetime': datetime_str,
             'title': title,
@@ -378,77 +569,166 @@ def add_news_event(datetime_str: str, title: str, currency: str, impact: str) ->
             'impact': impact
         }
         
-        # Add to events
-        news_events.append(new_event)
-        
-        # Sort by datetime
-        news_events.sort(key=lambda x: x['datetime'])
-        
-        # Save back to cache
-        save_news_cache(news_events, cache_data.get('last_updated'), api_available=api_available)
+        # Manual events survive API refreshes of their day
+        with get_db_connection() as cursor:
+            _upsert_events(cursor, [new_event], 'manual')
         
+        invalidate_news_index()
         return True
     except Exception as e:
         print(f"Error adding news event: {e}")
         return False
 
 
-def clean_old_news(days_to_keep: int = 1) -> None:
+def _stale_days(fetched_days: Dict[str, str], now: datetime) -> List[date]:
+    """
+    Days in the prefetch window that need (re)fetching.
+    
+    Today and tomorrow are refetched once older than NEWS_NEAR_DAY_REFRESH_MINUTES
+    (times and figures still move); later days once older than
+    NEWS_FAR_DAY_REFRESH_HOURS. Past days are history and never refetched.
+    """
+    today = now.date()
+    stale = []
+    for offset in range(config.NEWS_PREFETCH_DAYS + 1):
+        day = today + timedelta(days=offset)
+        fetched_at = fetched_days.get(day.strftime('%Y-%m-%d'))
+        if fetched_at is None:
+            stale.append(day)
+            continue
+        try:
+            age = now - utils.parse_datetime(fetched_at)
+        except ValueError:
+            stale.append(day)
+            continue
+        if offset <= 1:
+            max_age = timedelta(minutes=config.NEWS_NEAR_DAY_REFRESH_MINUTES)
+        else:
+            max_age = timedelta(hours=config.NEWS_FAR_DAY_REFRESH_HOURS)
+        if age >= max_age:
+            stale.append(day)
+    return stale
+
+
+def _contiguous_ranges(days: List[date]) -> List[Tuple[date, date]]:
+    """Group sorted days into (first, last) runs so each run is one API call."""
+    ranges = []
+    for day in days:
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def _delete_old_news(cursor, days_to_keep: int) -> None:
+    cutoff = (utils.get_current_uk_time() - timedelta(days=days_to_keep)).replace(tzinfo=None)
+    cursor.execute("DELETE FROM news_events WHERE event_datetime < %s", (cutoff,))
+    cursor.execute("DELETE FROM news_calendar_days WHERE day < %s", (cutoff.date(),))
+
+
+def clean_old_news(days_to_keep: int = None) -> None:
     """
     Remove news events older than specified days.
     
     Args:
-        days_to_keep: Number of days of news to keep
+        days_to_keep: Number of days of news to keep (defaults to NEWS_HISTORY_DAYS)
     """
-    cache_data = load_news_cache()
-    news_events = cache_data.get('news', [])
-    api_available = cache_data.get('api_available', True)
+    if days_to_keep is None:
+        days_to_keep = config.NEWS_HISTORY_DAYS
     
-    if not news_events:
-        return
-    
-    cutoff_date = utils.get_current_uk_time() - timedelta(days=days_to_keep)
+    with get_db_connection() as cursor:
+        _delete_old_news(cursor, days_to_keep)
+    invalidate_news_index()
+
+
+def _refresh_calendar_locked(cursor) -> int:
+    """
+    Fetch stale days from the API and store them. Caller holds the refresh lock,
+    which alone serialises refreshers - no transaction stays open during API calls.
     
-    filtered_events = []
-    for event in news_events:
-        try:
-            event_time = utils.parse_datetime(event['datetime'])
-            if event_time >= cutoff_date:
-                filtered_events.append(event)
-        except (KeyError, ValueError):
-            continue
+    Returns:
+        Number of days fetched
+    """
+    # Drop history beyond the retention window first
+    _delete_old_news(cursor, config.NEWS_HISTORY_DAYS)
     
-    save_news_cache(filtered_events, cache_data.get('last_updated'), api_available=api_available)
+    cursor.execute("SELECT day, fetched_at FROM news_calendar_days")
+    fetched_days = {
+        row['day'].strftime('%Y-%m-%d'): utils.format_datetime(row['fetched_at'])
+        for row in cursor.fetchall()
+    }
+    cursor.execute("COMMIT")
+    now = utils.get_current_uk_time()
+    fetched_at = now.replace(tzinfo=None)
+    
+    # All HTTP first, so slow or retried requests never hold row locks on news_events
+    fetched = []
+    for first, last in _contiguous_ranges(_stale_days(fetched_days, now)):
+        news_events = fetch_fcs_api_news(first.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d'))
+        if news_events is None:
+            print("❌ News refresh failed - API error (serving stored calendar)")
+            break
+        fetched.append((first, last, news_events))
+    
+    days_fetched = 0
+    for first, last, news_events in fetched:
+        # API events on these days are replaced, so cancelled/rescheduled ones disappear;
+        # manual events are kept
+        range_start = datetime.combine(first, datetime.min.time())
+        range_end = datetime.combine(last + timedelta(days=1), datetime.min.time())
+        cursor.execute("""
+            DELETE FROM news_events
+            WHERE source = 'api' AND event_datetime >= %s AND event_datetime < %s
+        """, (range_start, range_end))
+        _upsert_events(cursor, news_events, 'api')
+        
+        days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        cursor.executemany("""
+            INSERT INTO news_calendar_days (day, fetched_at) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE fetched_at = VALUES(fetched_at)
+        """, [(day, fetched_at) for day in days])
+        # One short transaction per range
+        cursor.execute("COMMIT")
+        days_fetched += len(days)
+    
+    return days_fetched
 
 
 def refresh_daily_news() -> int:
     """
-    Refresh news cache with latest HIGH and MEDIUM impact news.
-    Fetches news for today.
+    Refresh the news calendar for today plus the next NEWS_PREFETCH_DAYS days.
+    
+    Only days that may have changed are requested, in one API call per run of
+    consecutive days. A database named lock makes sure a single worker fetches;
+    every replica reads the shared result.
     
     Returns:
-        Number of events fetched (0 if API error)
+        Number of events today
     """
-    print("🔄 Refreshing daily news cache...")
+    print("🔄 Refreshing news calendar...")
     
-    # Clean old news first
-    clean_old_news(days_to_keep=1)
-    
-    # Fetch new news from FCS API
-    all_news = fetch_daily_news()
-    
-    if all_news is None:
-        # API error
-        print("❌ News refresh failed - API error")
-        save_news_cache([], api_available=False)
-        return 0
-    elif len(all_news) == 0:
-        # No events but API working
-        print("✅ News refresh successful - No events today")
-        save_news_cache([], api_available=True)
-        return 0
+    if config.FCS_API_KEY and not fcs_client.is_available():
+        print("⚠️ FCS API circuit open - serving stored calendar")
+    elif config.FCS_API_KEY:
+        try:
+            with get_db_connection() as cursor:
+                cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (NEWS_REFRESH_LOCK_NAME,))
+                if not cursor.fetchone()['acquired']:
+                    print("ℹ️ Another worker is refreshing the news calendar")
+                else:
+                    try:
+                        # Commits as it goes, so the next lock holder sees every stored range
+                        days_fetched = _refresh_calendar_locked(cursor)
+                        print(f"✅ News calendar refreshed: {days_fetched} day(s) fetched")
+                    finally:
+                        cursor.execute("SELECT RELEASE_LOCK(%s)", (NEWS_REFRESH_LOCK_NAME,))
+                        cursor.fetchall()
+        except Exception as e:
+            print(f"❌ News refresh failed: {e}")
     else:
-        # Got events
-        save_news_cache(all_news, api_available=True)
-        print(f"✅ News cache refreshed with {len(all_news)} events")
-        return len(all_news)
+        print("⚠️ FCS_API_KEY not set - skipping fetch")
+    
+    invalidate_news_index()
+    todays_events, _ = get_todays_news()
+    return len(todays_events or [])
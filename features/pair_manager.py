@@ -3,6 +3,7 @@ Pair Manager - Handle user's favorite trading pairs
 """
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
+from database import run_db
 from features import user_manager
 
 
@@ -13,7 +14,7 @@ SELECT_ACTION, ADD_PAIR, DELETE_PAIR = range(3)
 async def manage_pairs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Show pair management menu."""
     user_id = update.effective_user.id
-    pairs = user_manager.get_user_pairs(user_id)
+    pairs = await run_db(user_manager.get_user_pairs, user_id)
     
     # Create pair buttons in rows of 3
     pair_buttons = []
@@ -69,7 +70,7 @@ async def handle_pair_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     elif data.startswith("delete_pair_"):
         pair = data.replace("delete_pair_", "")
-        success = user_manager.remove_user_pair(user_id, pair)
+        success = await run_db(user_manager.remove_user_pair, user_id, pair)
         
         if success:
             await query.message.edit_text(
@@ -114,7 +115,7 @@ async def receive_new_pair(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
         return ADD_PAIR
     
-    success = user_manager.add_user_pair(user_id, pair)
+    success = await run_db(user_manager.add_user_pair, user_id, pair)
     
     if success:
         await update.message.reply_html(
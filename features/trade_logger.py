@@ -4,6 +4,7 @@ Trade logger module - Guided conversation for logging new trades
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, CallbackQueryHandler
 import storage
+from database import run_db
 import utils
 from features import session_tag, status_rule, news_rule, user_manager
 
@@ -15,8 +16,8 @@ SELECT_ACCOUNT, SELECT_PAIR, DIRECTION, ENTRY, STOP_LOSS, TAKE_PROFIT, NOTES = r
 async def start_new_trade(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Start the trade logging conversation - Select account first."""
     user_id = update.effective_user.id
-    accounts = user_manager.get_user_accounts(user_id)
-    default_account = user_manager.get_default_account(user_id)
+    accounts = await run_db(user_manager.get_user_accounts, user_id)
+    default_account = await run_db(user_manager.get_default_account, user_id)
     
     # Create account selection buttons
     account_buttons = []
@@ -45,7 +46,7 @@ async def receive_account_selection(update: Update, context: ContextTypes.DEFAUL
     user_id = update.effective_user.id
     account_id = query.data.replace("select_acc_", "")
     
-    account = user_manager.get_account_by_id(user_id, account_id)
+    account = await run_db(user_manager.get_account_by_id, user_id, account_id)
     if not account:
         await query.message.edit_text("❌ Account not found")
         return ConversationHandler.END
@@ -53,7 +54,7 @@ async def receive_account_selection(update: Update, context: ContextTypes.DEFAUL
     context.user_data['account'] = account
     
     # Get user's pairs
-    pairs = user_manager.get_user_pairs(user_id)
+    pairs = await run_db(user_manager.get_user_pairs, user_id)
     
     # Create pair buttons in rows of 3
     pair_buttons = []
@@ -231,18 +232,16 @@ async def receive_notes(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     
     # Auto-generate data
     telegram_id = update.effective_user.id
-    trade_id = storage.get_next_trade_id(telegram_id)
     
     datetime_str = utils.get_current_datetime_string()
     trade_datetime = utils.get_current_uk_time()
     session = session_tag.get_session()
     status = 'OPEN'
-    news_risk = news_rule.check_news_risk(trade_datetime)
+    news_risk = await run_db(news_rule.check_news_risk, trade_datetime, pair)
     result = ''
     
     # Create trade data
     trade_data = {
-        'trade_id': trade_id,
         'account_id': account['id'],
         'datetime': datetime_str,
         'pair': pair,
@@ -257,10 +256,10 @@ async def receive_notes(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         'notes': notes
     }
     
-    # Save to database
-    success = storage.save_trade(trade_data, telegram_id)
+    # Save to database (trade ID is allocated atomically during the insert)
+    trade_id = await run_db(storage.save_trade, trade_data, telegram_id)
     
-    if success:
+    if trade_id:
         # Format confirmation message
         session_display = session_tag.format_session_display(session)
         status_display = status_rule.format_status_display(status)
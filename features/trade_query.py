@@ -3,7 +3,9 @@ Trade query module - List and filter trades
 """
 from telegram import Update
 from telegram.ext import ContextTypes
+import analytics
 import storage
+from database import run_db
 import utils
 from features import session_tag, status_rule, user_manager
 
@@ -13,7 +15,7 @@ async def show_open_trades(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     user_id = update.effective_user.id
     
     # Get all open trades from database
-    user_open_trades = storage.get_open_trades(user_id)
+    user_open_trades = await run_db(storage.get_open_trades, user_id)
     
     if not user_open_trades:
         await update.message.reply_html(
@@ -24,7 +26,7 @@ async def show_open_trades(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return
     
     # Get user's accounts for display names
-    user_config = user_manager.load_user_config(user_id)
+    user_config = await run_db(user_manager.load_user_config, user_id)
     accounts_map = {acc['id']: acc['name'] for acc in user_config['accounts']}
     
     message = f"📊 <b>Open Trades ({len(user_open_trades)})</b>\n"
@@ -60,7 +62,7 @@ async def show_recent_trades(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     
     # Get all trades from database
-    user_trades = storage.read_all_trades(user_id)
+    user_trades = await run_db(storage.read_all_trades, user_id)
     
     if not user_trades:
         await update.message.reply_html(
@@ -71,7 +73,7 @@ async def show_recent_trades(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     # Get user's accounts for display names
-    user_config = user_manager.load_user_config(user_id)
+    user_config = await run_db(user_manager.load_user_config, user_id)
     accounts_map = {acc['id']: acc['name'] for acc in user_config['accounts']}
     
     # Get last 20 trades (already sorted newest first by database)
@@ -107,3 +109,56 @@ async def show_recent_trades(update: Update, context: ContextTypes.DEFAULT_TYPE)
     )
     
     await update.message.reply_html(message)
+
+
+async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Display overall and per-account performance statistics."""
+    user_id = update.effective_user.id
+    
+    records = await run_db(storage.read_trade_records, user_id)
+    
+    if not records:
+        await update.message.reply_html(
+            "📈 <b>Your Statistics</b>\n\n"
+            "No trades found.\n\n"
+            "💡 Use /newtrade to log your first trade"
+        )
+        return
+    
+    user_accounts = await run_db(user_manager.get_user_accounts, user_id)
+    accounts = [
+        {'account_id': acc['id'], 'account_name': acc['name'], 'is_default': acc['is_default']}
+        for acc in user_accounts
+    ]
+    
+    metrics = analytics.compute_metrics(records, accounts)
+    stats = metrics['stats']
+    
+    message = (
+        "📈 <b>Your Statistics</b>\n"
+        "👤 All Your Accounts\n\n"
+        f"📊 Total Trades: <b>{stats['total_trades']}</b>\n"
+        f"🟢 Open: <b>{stats['open_trades']}</b> • 🔴 Closed: <b>{stats['closed_trades']}</b>\n"
+        f"✅ Wins: <b>{stats['wins']}</b> • ❌ Losses: <b>{stats['losses']}</b> • ⚖️ BE: <b>{stats['break_even']}</b>\n"
+        f"🎯 Win Rate: <b>{stats['win_rate']}%</b>\n"
+        f"🔥 Best Win Streak: <b>{stats['max_win_streak']}</b>\n"
+        f"🧊 Worst Loss Streak: <b>{stats['max_loss_streak']}</b>\n"
+        f"⚖️ Profit Factor: <b>{stats['profit_factor']}</b>\n\n"
+    )
+    
+    if len(accounts) > 1:
+        message += "💼 <b>By Account</b>\n"
+        for acc_stats in metrics['account_stats'].values():
+            message += (
+                f"• {acc_stats['account_name']}: {acc_stats['total_trades']} trades, "
+                f"{acc_stats['win_rate']:.1f}% win rate\n"
+            )
+        message += "\n"
+    
+    message += "💱 <b>By Pair</b>\n"
+    for pair, pair_stats in sorted(metrics['pair_stats'].items(), key=lambda item: -item[1]['total']):
+        message += f"• {pair}: {pair_stats['total']} trades, {pair_stats['win_rate']:.1f}% win rate\n"
+    
+    message += "\n📊 Use /dashboard for charts and full history"
+    
+    await update.message.reply_html(message)
@@ -4,6 +4,7 @@ Trade update module - Update trade results (W/L/BE)
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, CallbackQueryHandler
 import storage
+from database import run_db
 import utils
 from features import status_rule, user_manager
 
@@ -17,7 +18,7 @@ async def start_update_trade(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     
     # Get open trades from database
-    open_trades = storage.get_open_trades(user_id)
+    open_trades = await run_db(storage.get_open_trades, user_id)
     
     if not open_trades:
         await update.message.reply_html(
@@ -62,7 +63,7 @@ async def receive_trade_selection(update: Update, context: ContextTypes.DEFAULT_
     context.user_data['update_trade_id'] = trade_id
     
     # Get trade details from database
-    trade = storage.get_trade_by_id(trade_id, update.effective_user.id)
+    trade = await run_db(storage.get_trade_by_id, trade_id, update.effective_user.id)
     
     if not trade:
         await query.edit_message_text("❌ Trade not found.")
@@ -124,11 +125,11 @@ async def receive_result(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     }
     
     # Update in database
-    success = storage.update_trade(trade_id, updates, user_id)
+    success = await run_db(storage.update_trade, trade_id, updates, user_id)
     
     if success:
         # Get updated trade details for confirmation
-        trade = storage.get_trade_by_id(trade_id, user_id)
+        trade = await run_db(storage.get_trade_by_id, trade_id, user_id)
         
         result_display = status_rule.format_result_display(result)
         status_display = status_rule.format_status_display(new_status)
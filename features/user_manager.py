@@ -4,6 +4,7 @@ User Manager - Handle user configurations, pairs, and accounts
 from typing import List, Dict, Optional
 from datetime import datetime
 from database import get_db_connection
+import dashboard_cache
 import config
 import utils
 
@@ -151,8 +152,9 @@ def save_user_config(telegram_id: int, config_data: Dict) -> None:
     try:
         with get_db_connection() as cursor:
             cursor.execute("""
-                UPDATE users SET email = %s WHERE telegram_id = %s
+                UPDATE users SET email = %s, data_version = data_version + 1 WHERE telegram_id = %s
             """, (config_data.get('email'), telegram_id))
+        dashboard_cache.invalidate_user(telegram_id)
     except Exception as e:
         print(f"❌ Error saving user config: {e}")
 
@@ -282,11 +284,13 @@ def add_user_account(telegram_id: int, account_name: str) -> Dict:
             """, (telegram_id, account_id))
             
             result = cursor.fetchone()
-            return {
-                'id': result['account_id'],
-                'name': result['account_name'],
-                'is_default': result['is_default']
-            }
+            dashboard_cache.bump_version(cursor, telegram_id)
+        
+        return {
+            'id': result['account_id'],
+            'name': result['account_name'],
+            'is_default': result['is_default']
+        }
     except Exception as e:
         print(f"❌ Error adding account: {e}")
         return None
@@ -344,7 +348,9 @@ def remove_user_account(telegram_id: int, account_id: str) -> bool:
                     )
                 """, (telegram_id, telegram_id))
             
-            return True
+            dashboard_cache.bump_version(cursor, telegram_id)
+        
+        return True
     except Exception as e:
         print(f"❌ Error removing account: {e}")
         return False
@@ -366,7 +372,11 @@ def rename_user_account(telegram_id: int, account_id: str, new_name: str) -> boo
                 AND account_id = %s
             """, (new_name, telegram_id, account_id))
             
-            return cursor.rowcount > 0
+            renamed = cursor.rowcount > 0
+            if renamed:
+                dashboard_cache.bump_version(cursor, telegram_id)
+        
+        return renamed
     except Exception as e:
         print(f"❌ Error renaming account: {e}")
         return False
@@ -434,7 +444,9 @@ def set_default_account(telegram_id: int, account_id: str) -> bool:
                 AND account_id = %s
             """, (telegram_id, account_id))
             
-            return True
+            dashboard_cache.bump_version(cursor, telegram_id)
+        
+        return True
     except Exception as e:
         print(f"❌ Error setting default account: {e}")
         return False
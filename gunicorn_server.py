@@ -0,0 +1,65 @@
+"""
+Production dashboard server - gunicorn with several worker processes, each
+running a thread pool, instead of Flask's single-threaded development server
+"""
+import os
+from gunicorn.app.base import BaseApplication
+import config
+import database
+
+
+def on_starting(server) -> None:
+    """Migrate once in the master, then drop its connections before workers fork."""
+    try:
+        database.init_database()
+    except Exception as e:
+        print(f"❌ Failed to initialize database: {e}")
+    finally:
+        # Sockets must not be shared across forked workers; each opens its own pool
+        database.close_pool()
+
+
+def worker_exit(server, worker) -> None:
+    """Close this worker's pooled connections once in-flight requests have finished."""
+    database.close_pool()
+
+
+class DashboardServer(BaseApplication):
+    """gunicorn application serving web_server.app, configured from config.py."""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Imported in each worker (no preload), so nothing opened at import time is shared
+        from web_server import app
+        return app
+
+
+def serve() -> None:
+    """
+    Serve the dashboard on PORT until SIGTERM/SIGINT.
+
+    SIGTERM is a graceful shutdown: workers stop accepting connections and
+    get WEB_GRACEFUL_TIMEOUT_SECONDS to finish in-flight requests.
+    """
+    port = int(os.getenv('PORT', 8080))
+    print(f"🌐 Starting dashboard on port {port} "
+          f"({config.WEB_WORKERS} workers x {config.WEB_THREADS} threads)")
+    DashboardServer({
+        'bind': f"0.0.0.0:{port}",
+        'workers': config.WEB_WORKERS,
+        'threads': config.WEB_THREADS,
+        'worker_class': 'gthread',
+        'timeout': config.WEB_TIMEOUT_SECONDS,
+        'graceful_timeout': config.WEB_GRACEFUL_TIMEOUT_SECONDS,
+        'keepalive': 5,
+        'preload_app': False,
+        'on_starting': on_starting,
+        'worker_exit': worker_exit
+    }).run()
@@ -0,0 +1,74 @@
+"""
+JSON serialization for API payloads - orjson when installed, stdlib json
+otherwise. Both handle Decimal, datetime/date and dataclass values directly,
+so database rows can be serialized without converting each field first.
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict
+import config
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Convert the types json/orjson don't handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    # datetime, date and dataclasses are native; only Decimal goes through _default
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+SERIALIZERS: Dict[str, Callable[[Any], bytes]] = {'stdlib': _stdlib_dumps}
+if orjson is not None:
+    SERIALIZERS['orjson'] = _orjson_dumps
+
+
+def _resolve_backend(choice: str) -> str:
+    if choice == 'auto':
+        return 'orjson' if orjson is not None else 'stdlib'
+    if choice not in SERIALIZERS:
+        print(f"⚠️ JSON_SERIALIZER '{choice}' unavailable - using stdlib json")
+        return 'stdlib'
+    return choice
+
+
+BACKEND = _resolve_backend(config.JSON_SERIALIZER)
+_dumps = SERIALIZERS[BACKEND]
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON.
+
+    Args:
+        obj: Dicts, lists and scalars, plus Decimal, datetime/date and dataclass values
+
+    Returns:
+        JSON bytes
+    """
+    return _dumps(obj)
+
+
+def loads(data) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,56 @@
+"""
+Maintenance commands for the Trading Journal database
+
+Usage:
+    python manage.py rebuild-stats [--telegram-id ID]
+    python manage.py backfill-news-risk [--telegram-id ID] [--batch-size N] [--restart] [--fetch-missing]
+"""
+import argparse
+import sys
+import database
+import news_backfill
+import storage
+
+
+def rebuild_stats(args) -> int:
+    """Rebuild the user_stats rollup from the trades table."""
+    database.init_database()
+    storage.rebuild_user_stats(telegram_id=args.telegram_id)
+    return 0
+
+
+def backfill_news_risk(args) -> int:
+    """Recompute news_risk for historical trades against the news calendar."""
+    database.init_database()
+    news_backfill.backfill_news_risk(
+        telegram_id=args.telegram_id,
+        batch_size=args.batch_size,
+        restart=args.restart,
+        fetch_missing=args.fetch_missing
+    )
+    return 0
+
+
+def main() -> int:
+    """Parse arguments and run the requested maintenance command."""
+    parser = argparse.ArgumentParser(description="Trading Journal maintenance commands")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = subparsers.add_parser('rebuild-stats', help="Backfill/repair the user_stats rollup table")
+    rebuild.add_argument('--telegram-id', type=int, default=None, help="Only rebuild this user")
+    rebuild.set_defaults(func=rebuild_stats)
+
+    backfill = subparsers.add_parser('backfill-news-risk', help="Recompute news_risk for historical trades")
+    backfill.add_argument('--telegram-id', type=int, default=None, help="Only backfill this user's trades")
+    backfill.add_argument('--batch-size', type=int, default=500, help="Trades per batch/transaction")
+    backfill.add_argument('--restart', action='store_true', help="Ignore the saved checkpoint")
+    backfill.add_argument('--fetch-missing', action='store_true',
+                          help="Fetch never-fetched calendar days from the FCS API first")
+    backfill.set_defaults(func=backfill_news_risk)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
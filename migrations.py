@@ -0,0 +1,333 @@
+"""
+Versioned schema migrations
+
+Each migration runs once and is recorded in the schema_version table.
+Add new migrations to the end of MIGRATIONS with the next number - never
+edit or renumber one that has already shipped.
+"""
+from typing import Callable, List, Tuple
+import mysql.connector
+
+
+# MySQL error codes tolerated so migrations can run against databases
+# that were set up before versioning existed
+ER_DUP_FIELDNAME = 1060   # Duplicate column name
+ER_DUP_KEYNAME = 1061     # Duplicate key name
+ER_CANT_DROP_KEY = 1091   # Can't DROP index; check that it exists
+ER_NO_SUCH_TABLE = 1146   # Table doesn't exist
+
+MIGRATION_LOCK_NAME = 'trading_journal_schema_migrations'
+MIGRATION_LOCK_TIMEOUT_SECONDS = 60
+
+
+def _create_index(cursor, name: str, table: str, columns: str, unique: bool = False) -> None:
+    """Create an index, ignoring it if it already exists."""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    try:
+        cursor.execute(f"CREATE {kind} {name} ON {table}({columns})")
+    except mysql.connector.Error as e:
+        if e.errno != ER_DUP_KEYNAME:
+            raise
+
+
+def _drop_index(cursor, name: str, table: str) -> None:
+    """Drop an index, ignoring it if it doesn't exist."""
+    try:
+        cursor.execute(f"DROP INDEX {name} ON {table}")
+    except mysql.connector.Error as e:
+        if e.errno != ER_CANT_DROP_KEY:
+            raise
+
+
+def migration_001_baseline(cursor) -> None:
+    """Core tables: users, accounts, pairs, trades."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            telegram_id BIGINT UNIQUE NOT NULL,
+            username VARCHAR(255),
+            first_name VARCHAR(255),
+            last_name VARCHAR(255),
+            email VARCHAR(255),
+            config JSON,
+            registration_date TIMESTAMP NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_telegram_id (telegram_id)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            account_id VARCHAR(50) NOT NULL,
+            account_name VARCHAR(255) NOT NULL,
+            is_default BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_user_account (user_id, account_id),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pairs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            pair_name VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_user_pair (user_id, pair_name),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trades (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            trade_id VARCHAR(50) UNIQUE NOT NULL,
+            user_id INT NOT NULL,
+            account_id VARCHAR(50) NOT NULL,
+            pair VARCHAR(20) NOT NULL,
+            direction VARCHAR(10) NOT NULL,
+            entry_price DECIMAL(20, 5) NOT NULL,
+            stop_loss DECIMAL(20, 5),
+            take_profit DECIMAL(20, 5),
+            status VARCHAR(20) NOT NULL,
+            result VARCHAR(10),
+            session VARCHAR(20),
+            news_risk VARCHAR(20),
+            notes TEXT,
+            entry_datetime TIMESTAMP NOT NULL,
+            exit_datetime TIMESTAMP NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    _create_index(cursor, 'idx_trades_user_id', 'trades', 'user_id')
+    _create_index(cursor, 'idx_trades_status', 'trades', 'status')
+    _create_index(cursor, 'idx_trades_entry_datetime', 'trades', 'entry_datetime')
+
+
+def migration_002_user_stats(cursor) -> None:
+    """Per-user statistics rollup, backfilled from existing trades."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INT NOT NULL,
+            account_id VARCHAR(50) NOT NULL,
+            pair VARCHAR(20) NOT NULL,
+            session VARCHAR(20) NOT NULL DEFAULT '',
+            trade_count INT NOT NULL DEFAULT 0,
+            open_count INT NOT NULL DEFAULT 0,
+            closed_count INT NOT NULL DEFAULT 0,
+            wins INT NOT NULL DEFAULT 0,
+            losses INT NOT NULL DEFAULT 0,
+            break_even INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, account_id, pair, session),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    import storage
+    # users.data_version only exists from migration 10
+    storage.rebuild_user_stats(cursor=cursor, bump_versions=False)
+
+
+def migration_003_trade_history_indexes(cursor) -> None:
+    """Keyset pagination indexes for /api/trades."""
+    _create_index(cursor, 'idx_trades_user_entry', 'trades', 'user_id, entry_datetime, id')
+    _create_index(cursor, 'idx_trades_user_account_entry', 'trades', 'user_id, account_id, entry_datetime, id')
+
+
+def migration_004_composite_trade_indexes(cursor) -> None:
+    """
+    Composite indexes for the hot per-user queries, and trade_id unique per
+    user instead of globally (so every user can have their own T1, T2...).
+    """
+    # Open-trades lookups: WHERE user_id = ? AND status = ? ORDER BY entry_datetime
+    _create_index(cursor, 'idx_trades_user_status_entry', 'trades', 'user_id, status, entry_datetime')
+    # get_trade_by_id / update_trade: WHERE trade_id = ? AND user_id = ?
+    _create_index(cursor, 'uq_trades_user_trade_id', 'trades', 'user_id, trade_id', unique=True)
+    _drop_index(cursor, 'trade_id', 'trades')
+
+    # Covered by the composite indexes above (user_id is their leading column)
+    _drop_index(cursor, 'idx_trades_user_id', 'trades')
+    _drop_index(cursor, 'idx_trades_status', 'trades')
+
+
+def migration_005_user_trade_counter(cursor) -> None:
+    """Per-user trade number counter, seeded from each user's highest T<n>."""
+    try:
+        cursor.execute("ALTER TABLE users ADD COLUMN last_trade_number INT NOT NULL DEFAULT 0")
+    except mysql.connector.Error as e:
+        if e.errno != ER_DUP_FIELDNAME:
+            raise
+
+    cursor.execute("""
+        UPDATE users u
+        SET last_trade_number = (
+            SELECT COALESCE(MAX(CAST(SUBSTRING(t.trade_id, 2) AS UNSIGNED)), 0)
+            FROM trades t
+            WHERE t.user_id = u.id AND t.trade_id REGEXP '^T[0-9]+$'
+        )
+    """)
+
+
+def migration_006_subscriptions(cursor) -> None:
+    """Persistent news alert subscriptions with per-chat preferences."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS subscriptions (
+            chat_id BIGINT PRIMARY KEY,
+            telegram_id BIGINT NULL,
+            currencies VARCHAR(255) NOT NULL DEFAULT '',
+            min_impact VARCHAR(10) NOT NULL DEFAULT 'MEDIUM',
+            mute_start_hour TINYINT NULL,
+            mute_end_hour TINYINT NULL,
+            active BOOLEAN NOT NULL DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_subscriptions_active (active)
+        )
+    """)
+
+
+def migration_007_news_events(cursor) -> None:
+    """Shared news calendar (replaces each replica's local JSON file)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS news_events (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            event_datetime DATETIME NOT NULL,
+            currency VARCHAR(10) NOT NULL DEFAULT '',
+            title VARCHAR(255) NOT NULL,
+            impact VARCHAR(10) NOT NULL,
+            source VARCHAR(10) NOT NULL DEFAULT 'api',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_news_event (event_datetime, currency, title),
+            INDEX idx_news_currency_datetime (currency, event_datetime)
+        )
+    """)
+
+    # When each calendar day was last fetched from the API
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS news_calendar_days (
+            day DATE PRIMARY KEY,
+            fetched_at DATETIME NOT NULL
+        )
+    """)
+
+
+def migration_008_job_checkpoints(cursor) -> None:
+    """Resume points for long-running maintenance jobs (e.g. news risk backfill)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_checkpoints (
+            job_name VARCHAR(100) PRIMARY KEY,
+            checkpoint VARCHAR(255) NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def migration_009_dashboard_tokens(cursor) -> None:
+    """Dashboard link tokens shared by every process (DASHBOARD_TOKEN_STORE=database)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_tokens (
+            token VARCHAR(64) PRIMARY KEY,
+            telegram_id BIGINT NOT NULL,
+            expires_at DATETIME NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_dashboard_tokens_user_expires (telegram_id, expires_at),
+            INDEX idx_dashboard_tokens_expires (expires_at)
+        )
+    """)
+
+
+def migration_010_user_data_version(cursor) -> None:
+    """Per-user data version, bumped with every write that changes the dashboard."""
+    try:
+        cursor.execute("ALTER TABLE users ADD COLUMN data_version INT NOT NULL DEFAULT 0")
+    except mysql.connector.Error as e:
+        if e.errno != ER_DUP_FIELDNAME:
+            raise
+
+
+MIGRATIONS: List[Tuple[int, Callable]] = [
+    (1, migration_001_baseline),
+    (2, migration_002_user_stats),
+    (3, migration_003_trade_history_indexes),
+    (4, migration_004_composite_trade_indexes),
+    (5, migration_005_user_trade_counter),
+    (6, migration_006_subscriptions),
+    (7, migration_007_news_events),
+    (8, migration_008_job_checkpoints),
+    (9, migration_009_dashboard_tokens),
+    (10, migration_010_user_data_version),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(cursor) -> int:
+    """
+    Get the highest applied migration number.
+
+    Returns:
+        Schema version, or -1 if the schema_version table doesn't exist yet
+    """
+    try:
+        cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+    except mysql.connector.Error as e:
+        if e.errno == ER_NO_SUCH_TABLE:
+            return -1
+        raise
+    row = cursor.fetchone()
+    return row['version'] if row and row['version'] is not None else 0
+
+
+def apply_migrations(cursor) -> int:
+    """
+    Apply all pending migrations, serialised across processes with a named lock.
+
+    Args:
+        cursor: Open dictionary cursor
+
+    Returns:
+        Number of migrations applied (0 when the schema is already current)
+    """
+    # Fast path: one SELECT and no DDL when nothing is pending
+    if get_schema_version(cursor) >= LATEST_VERSION:
+        return 0
+
+    cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT_SECONDS))
+    if not cursor.fetchone()['acquired']:
+        raise RuntimeError("Timed out waiting for the schema migration lock")
+
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Another process may have migrated while we waited for the lock
+        current = get_schema_version(cursor)
+        applied = 0
+        for version, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"🔄 Applying migration {version}: {migration.__name__}")
+            migration(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                (version, migration.__name__)
+            )
+            # DDL commits implicitly; commit the data changes and version row too
+            cursor.execute("COMMIT")
+            applied += 1
+        return applied
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+        cursor.fetchall()
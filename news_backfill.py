@@ -0,0 +1,226 @@
+"""
+News risk backfill - recomputes trades.news_risk against the stored news
+calendar in one sorted pass, committing in resumable batches
+"""
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+from database import get_db_connection
+from features import news_rule
+import config
+import utils
+
+
+CHECKPOINT_PREFIX = 'news_risk_backfill'
+MAX_FETCH_RANGE_DAYS = 31  # Days per API call when fetching missing history
+
+
+class NewsRiskMerger:
+    """
+    Sorted merge of trade times against news event times.
+
+    Trades must be fed in non-decreasing time order; one pointer per
+    currency array only ever moves forward, so a full pass is O(n + m).
+    Gives the same answer as news_rule.check_news_risk.
+    """
+
+    def __init__(self, index: news_rule.NewsIndex, window_minutes: float):
+        self.window = window_minutes * 60
+        self.by_currency = index.alert_timestamps_by_currency
+        self.all_events = index.alert_timestamps
+        self.positions: Dict[Optional[str], int] = {}
+
+    def risk_at(self, ts: float, currencies: frozenset) -> str:
+        # None = every event (pair not recognised); '' = events of unknown currency
+        keys = list(currencies) + [''] if currencies else [None]
+        for key in keys:
+            timestamps = self.all_events if key is None else self.by_currency.get(key, [])
+            i = self.positions.get(key, 0)
+            while i < len(timestamps) and timestamps[i] < ts - self.window:
+                i += 1
+            self.positions[key] = i
+            if i < len(timestamps) and timestamps[i] <= ts + self.window:
+                return 'HIGH'
+        return 'LOW'
+
+
+def _load_checkpoint(cursor, job_name: str) -> Optional[Tuple[datetime, int]]:
+    cursor.execute("SELECT checkpoint FROM job_checkpoints WHERE job_name = %s", (job_name,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    entry_str, row_id = row['checkpoint'].rsplit('|', 1)
+    return datetime.strptime(entry_str, '%Y-%m-%d %H:%M:%S'), int(row_id)
+
+
+def _save_checkpoint(cursor, job_name: str, position: Tuple[datetime, int]) -> None:
+    cursor.execute("""
+        INSERT INTO job_checkpoints (job_name, checkpoint) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE checkpoint = VALUES(checkpoint)
+    """, (job_name, f"{utils.format_datetime(position[0])}|{position[1]}"))
+
+
+def _clear_checkpoint(cursor, job_name: str) -> None:
+    cursor.execute("DELETE FROM job_checkpoints WHERE job_name = %s", (job_name,))
+
+
+def load_calendar_index(fetch_missing_since: Optional[date] = None) -> news_rule.NewsIndex:
+    """
+    Build a news index over the whole stored calendar, optionally fetching
+    days that were never fetched from the API (kept in memory only, since the
+    retention window would prune them from the news tables).
+
+    Args:
+        fetch_missing_since: Fetch unfetched days from this date up to today
+
+    Returns:
+        NewsIndex covering the stored (and fetched) calendar
+    """
+    news_rule.invalidate_news_index()
+    index = news_rule.get_news_index()
+    if fetch_missing_since is None:
+        return index
+
+    today = utils.get_current_uk_time().date()
+    missing = []
+    day = fetch_missing_since
+    while day <= today:
+        if day.strftime('%Y-%m-%d') not in index.fetched_days:
+            missing.append(day)
+        day += timedelta(days=1)
+
+    news_events = list(index.events)
+    fetched_days = dict(index.fetched_days)
+    fetched_at = utils.get_current_datetime_string()
+    for first, last in news_rule._contiguous_ranges(missing):
+        while first <= last:
+            chunk_end = min(last, first + timedelta(days=MAX_FETCH_RANGE_DAYS - 1))
+            fetched = news_rule.fetch_fcs_api_news(first.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d'))
+            if fetched is None:
+                print("⚠️ API error - continuing with the stored calendar only")
+                return news_rule.NewsIndex({'news': news_events, 'fetched_days': fetched_days})
+            news_events.extend(fetched)
+            while first <= chunk_end:
+                fetched_days[first.strftime('%Y-%m-%d')] = fetched_at
+                first += timedelta(days=1)
+
+    return news_rule.NewsIndex({'news': news_events, 'fetched_days': fetched_days})
+
+
+def backfill_news_risk(telegram_id: int = None, batch_size: int = 500,
+                       restart: bool = False, fetch_missing: bool = False) -> Dict:
+    """
+    Recompute news_risk for historical trades.
+
+    Trades are read in (entry_datetime, id) order in batches; each batch's
+    UPDATEs and the checkpoint are committed together, so an interrupted run
+    resumes where it stopped. Trades on days with no calendar data are left
+    unchanged.
+
+    Args:
+        telegram_id: Only backfill this user's trades (all users if None)
+        batch_size: Trades per batch/transaction
+        restart: Ignore any saved checkpoint and start from the oldest trade
+        fetch_missing: Fetch never-fetched calendar days from the API first
+
+    Returns:
+        Dictionary with processed, updated and skipped counts
+    """
+    job_name = f"{CHECKPOINT_PREFIX}:{telegram_id if telegram_id is not None else 'all'}"
+
+    user_clause = ""
+    user_params = []
+    if telegram_id is not None:
+        user_clause = "AND user_id = (SELECT id FROM users WHERE telegram_id = %s)"
+        user_params = [telegram_id]
+
+    with get_db_connection() as cursor:
+        if restart:
+            _clear_checkpoint(cursor, job_name)
+        after = _load_checkpoint(cursor, job_name)
+
+        keyset_clause, keyset_params = "", []
+        if after is not None:
+            keyset_clause = "AND (entry_datetime > %s OR (entry_datetime = %s AND id > %s))"
+            keyset_params = [after[0], after[0], after[1]]
+        cursor.execute(f"""
+            SELECT COUNT(*) AS remaining, MIN(entry_datetime) AS first_entry
+            FROM trades WHERE 1 = 1 {user_clause} {keyset_clause}
+        """, user_params + keyset_params)
+        summary = cursor.fetchone()
+
+    total = summary['remaining']
+    if after is not None:
+        print(f"↩️ Resuming from trade #{after[1]} ({utils.format_datetime(after[0])})")
+    if not total:
+        print("✅ Nothing to backfill")
+        return {'processed': 0, 'updated': 0, 'skipped': 0}
+
+    index = load_calendar_index(summary['first_entry'].date() if fetch_missing else None)
+    covered_days = set(index.fetched_days) | {event['datetime'][:10] for event in index.events}
+    merger = NewsRiskMerger(index, config.NEWS_RISK_WINDOW_MINUTES)
+
+    stats = {'processed': 0, 'updated': 0, 'skipped': 0}
+    started = time.monotonic()
+
+    while True:
+        with get_db_connection() as cursor:
+            keyset_clause, keyset_params = "", []
+            if after is not None:
+                keyset_clause = "AND (entry_datetime > %s OR (entry_datetime = %s AND id > %s))"
+                keyset_params = [after[0], after[0], after[1]]
+            cursor.execute(f"""
+                SELECT id, pair, entry_datetime, news_risk
+                FROM trades
+                WHERE 1 = 1 {user_clause} {keyset_clause}
+                ORDER BY entry_datetime, id
+                LIMIT %s
+            """, user_params + keyset_params + [batch_size])
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            changes = {'HIGH': [], 'LOW': []}
+            for row in rows:
+                entry = row['entry_datetime']
+                if entry.strftime('%Y-%m-%d') not in covered_days:
+                    stats['skipped'] += 1
+                    continue
+                ts = config.TIMEZONE.localize(entry).timestamp()
+                risk = merger.risk_at(ts, news_rule.pair_currencies(row['pair']))
+                if risk != row['news_risk']:
+                    changes[risk].append(row['id'])
+
+            for risk, ids in changes.items():
+                if ids:
+                    placeholders = ', '.join(['%s'] * len(ids))
+                    cursor.execute(
+                        f"UPDATE trades SET news_risk = %s WHERE id IN ({placeholders})",
+                        [risk] + ids
+                    )
+                    # Dashboards show news risk, so their owners' cached payloads are stale
+                    cursor.execute(f"""
+                        UPDATE users SET data_version = data_version + 1
+                        WHERE id IN (SELECT DISTINCT user_id FROM trades WHERE id IN ({placeholders}))
+                    """, ids)
+                    stats['updated'] += len(ids)
+
+            after = (rows[-1]['entry_datetime'], rows[-1]['id'])
+            # Same transaction as the updates, so a crash never skips or repeats a batch
+            _save_checkpoint(cursor, job_name, after)
+
+        stats['processed'] += len(rows)
+        elapsed = time.monotonic() - started
+        rate = stats['processed'] / elapsed if elapsed > 0 else 0.0
+        eta = (total - stats['processed']) / rate if rate else 0.0
+        print(
+            f"🔄 {stats['processed']}/{total} trades ({stats['processed'] * 100 // total}%), "
+            f"{stats['updated']} updated, {stats['skipped']} skipped - {rate:.0f}/s, ETA {eta:.0f}s"
+        )
+
+    with get_db_connection() as cursor:
+        _clear_checkpoint(cursor, job_name)
+
+    print(f"✅ News risk backfill complete: {stats['processed']} trades, "
+          f"{stats['updated']} updated, {stats['skipped']} without calendar data")
+    return stats
@@ -1,12 +1,14 @@
 """
 Startup script - Runs both the Telegram bot and web dashboard server
 """
+import asyncio
 import os
+import signal
+import subprocess
 import sys
 import threading
 import logging
-from web_server import app
-import bot
+import config
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -16,18 +18,51 @@ logger = logging.getLogger(__name__)
 
 
 def run_web_server():
-    """Run Flask web server in a separate thread."""
-    port = int(os.getenv('PORT', 8080))
-    logger.info(f"Starting web server on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+    """Run the dashboard: gunicorn workers, or Flask's development server (WEB_SERVER=flask)."""
+    if config.WEB_SERVER == 'flask':
+        from web_server import app
+        port = int(os.getenv('PORT', 8080))
+        logger.info(f"Starting development web server on port {port}")
+        app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+        return
+
+    import gunicorn_server
+    gunicorn_server.serve()
+
+
+def start_web_process() -> subprocess.Popen:
+    """Run the web tier in its own process so it never shares the bot's GIL."""
+    logger.info("Starting web server process")
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), 'web'])
+
+
+def stop_web_process(process: subprocess.Popen) -> None:
+    """SIGTERM the web process (gunicorn drains in-flight requests), then wait for it."""
+    if process.poll() is not None:
+        return
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=config.WEB_GRACEFUL_TIMEOUT_SECONDS + 5)
+    except subprocess.TimeoutExpired:
+        logger.warning("Web server did not stop in time - killing it")
+        process.kill()
+        process.wait()
 
 
 def run_bot():
     """Run Telegram bot in foreground."""
+    import bot
     logger.info("Starting Telegram bot")
     bot.main()
 
 
+def run_webhook():
+    """Serve Telegram webhook updates and the dashboard on one ASGI server."""
+    import webhook_server  # uvicorn/a2wsgi are only needed in this mode
+    logger.info("Starting bot + web server in webhook mode")
+    asyncio.run(webhook_server.serve())
+
+
 def resolve_start_mode() -> str:
     """Resolve run mode from CLI arg first, then START_MODE env var."""
     if len(sys.argv) > 1 and sys.argv[1].strip():
@@ -35,9 +70,34 @@ def resolve_start_mode() -> str:
     return os.getenv('START_MODE', 'both').strip().lower()
 
 
+def check_token_store(mode: str) -> None:
+    """
+    Raises:
+        RuntimeError: If DASHBOARD_TOKEN_STORE=memory, but the process issuing
+            dashboard links isn't the one verifying them
+    """
+    if config.DASHBOARD_TOKEN_STORE != 'memory':
+        return
+    if mode == 'webhook' or (mode == 'both' and config.WEB_SERVER == 'flask'):
+        return
+    raise RuntimeError(
+        "DASHBOARD_TOKEN_STORE=memory needs the bot and dashboard in one process "
+        "(START_MODE=webhook, or START_MODE=both with WEB_SERVER=flask) - use database or jwt"
+    )
+
+
 def main():
-    """Start app based on mode: web, bot, or both."""
+    """Start app based on mode: web, bot, both, or webhook."""
     mode = resolve_start_mode()
+    if mode not in ('webhook', 'web', 'bot', 'both'):
+        logger.warning(f"Unknown START_MODE '{mode}', defaulting to 'both'")
+        mode = 'both'
+    check_token_store(mode)
+
+    if mode == 'webhook':
+        logger.info("START_MODE=webhook")
+        run_webhook()
+        return
 
     if mode == 'web':
         logger.info("START_MODE=web")
@@ -49,18 +109,23 @@ def main():
         run_bot()
         return
 
-    if mode != 'both':
-        logger.warning(f"Unknown START_MODE '{mode}', defaulting to 'both'")
-
     logger.info("START_MODE=both")
 
-    # Start web server in background thread so the process binds to PORT.
-    web_thread = threading.Thread(target=run_web_server, daemon=True)
-    web_thread.start()
-    logger.info("Web server thread started")
+    if config.WEB_SERVER == 'flask':
+        # Development: web server in a background thread so the process binds to PORT
+        web_thread = threading.Thread(target=run_web_server, daemon=True)
+        web_thread.start()
+        logger.info("Web server thread started")
+        run_bot()
+        return
 
-    # Run bot in foreground (blocking)
-    run_bot()
+    # Production: web tier in a child process; the bot keeps this one.
+    # run_polling() returns on SIGTERM/SIGINT, then the web process is drained.
+    web_process = start_web_process()
+    try:
+        run_bot()
+    finally:
+        stop_web_process(web_process)
 
 
 if __name__ == '__main__':
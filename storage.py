@@ -4,6 +4,8 @@ Storage module for database-based trade data management
 from typing import List, Dict, Optional
 from datetime import datetime
 from database import get_db_connection
+import analytics
+import dashboard_cache
 import config
 
 
@@ -19,24 +21,156 @@ def get_user_id_from_telegram(telegram_id: int) -> Optional[int]:
         return None
 
 
-def save_trade(trade_data: Dict, telegram_id: int) -> bool:
+def _stats_bucket(trade: Dict) -> Dict:
+    """
+    Map a trade's status/result to its user_stats counter contributions.
+    
+    Args:
+        trade: Dictionary with status and result
+        
+    Returns:
+        Dictionary of counter deltas for a single trade
+    """
+    status = trade.get('status')
+    result = trade.get('result')
+    closed = status == 'CLOSED'
+    return {
+        'trade_count': 1,
+        'open_count': 1 if status == 'OPEN' else 0,
+        'closed_count': 1 if closed else 0,
+        'wins': 1 if closed and result == 'W' else 0,
+        'losses': 1 if closed and result == 'L' else 0,
+        'break_even': 1 if closed and result == 'BE' else 0
+    }
+
+
+def _apply_stats_delta(cursor, user_id: int, trade: Dict, sign: int) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) one trade from the user_stats rollup.
+    Must run on the same cursor as the trade write so both commit together.
+    """
+    bucket = _stats_bucket(trade)
+    cursor.execute("""
+        INSERT INTO user_stats (
+            user_id, account_id, pair, session,
+            trade_count, open_count, closed_count, wins, losses, break_even
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            trade_count = trade_count + VALUES(trade_count),
+            open_count = open_count + VALUES(open_count),
+            closed_count = closed_count + VALUES(closed_count),
+            wins = wins + VALUES(wins),
+            losses = losses + VALUES(losses),
+            break_even = break_even + VALUES(break_even)
+    """, (
+        user_id,
+        trade['account_id'],
+        trade['pair'],
+        trade.get('session') or '',
+        sign * bucket['trade_count'],
+        sign * bucket['open_count'],
+        sign * bucket['closed_count'],
+        sign * bucket['wins'],
+        sign * bucket['losses'],
+        sign * bucket['break_even']
+    ))
+
+
+def rebuild_user_stats(telegram_id: int = None, cursor=None, bump_versions: bool = True) -> int:
+    """
+    Recompute the user_stats rollup from the trades table (backfill/repair).
+    
+    Args:
+        telegram_id: Only rebuild this user (all users if None)
+        cursor: Existing cursor to run on (opens a new connection if None)
+        bump_versions: Bump users.data_version so cached dashboards refresh
+            (False for migrations that run before that column exists)
+        
+    Returns:
+        Number of rollup rows written
+    """
+    if cursor is None:
+        with get_db_connection() as own_cursor:
+            return rebuild_user_stats(telegram_id, cursor=own_cursor, bump_versions=bump_versions)
+    
+    user_filter = ""
+    params = ()
+    if telegram_id is not None:
+        user_filter = "WHERE user_id = (SELECT id FROM users WHERE telegram_id = %s)"
+        params = (telegram_id,)
+    
+    cursor.execute(f"DELETE FROM user_stats {user_filter}", params)
+    cursor.execute(f"""
+        INSERT INTO user_stats (
+            user_id, account_id, pair, session,
+            trade_count, open_count, closed_count, wins, losses, break_even
+        )
+        SELECT
+            user_id, account_id, pair, COALESCE(session, ''),
+            COUNT(*),
+            SUM(status = 'OPEN'),
+            SUM(status = 'CLOSED'),
+            SUM(status = 'CLOSED' AND result = 'W'),
+            SUM(status = 'CLOSED' AND result = 'L'),
+            SUM(status = 'CLOSED' AND result = 'BE')
+        FROM trades
+        {user_filter}
+        GROUP BY user_id, account_id, pair, COALESCE(session, '')
+    """, params)
+    rows = cursor.rowcount
+    
+    if bump_versions:
+        # Rebuilt stats can differ from what dashboards have cached
+        version_filter = "WHERE telegram_id = %s" if telegram_id is not None else ""
+        cursor.execute(f"UPDATE users SET data_version = data_version + 1 {version_filter}", params)
+    print(f"✅ Rebuilt user_stats rollup ({rows} rows)")
+    return rows
+
+
+def save_trade(trade_data: Dict, telegram_id: int) -> Optional[str]:
     """
     Save a new trade to database.
     
+    The trade ID (T1, T2, ...) is allocated from the user's counter inside
+    the same transaction as the insert, so concurrent saves never collide.
+    A trade_id already present in trade_data is used as-is.
+    
     Args:
         trade_data: Dictionary containing all trade fields
         telegram_id: User's Telegram ID
         
     Returns:
-        True if successful, False otherwise
+        The saved trade ID if successful, None otherwise
     """
     try:
-        user_id = get_user_id_from_telegram(telegram_id)
-        if not user_id:
-            print(f"User not found: {telegram_id}")
-            return False
+        trade_row = {
+            'account_id': trade_data.get('account_id', 'main'),
+            'pair': trade_data['pair'],
+            'session': trade_data.get('session', ''),
+            'status': trade_data.get('status', 'OPEN'),
+            'result': trade_data.get('result', '')
+        }
         
         with get_db_connection() as cursor:
+            # Bump the per-user counter and dashboard data version; the row lock serialises concurrent saves
+            cursor.execute("""
+                UPDATE users
+                SET last_trade_number = LAST_INSERT_ID(last_trade_number + 1),
+                    data_version = data_version + 1
+                WHERE telegram_id = %s
+            """, (telegram_id,))
+            if cursor.rowcount == 0:
+                print(f"User not found: {telegram_id}")
+                return None
+            
+            cursor.execute("""
+                SELECT id, LAST_INSERT_ID() AS trade_number
+                FROM users WHERE telegram_id = %s
+            """, (telegram_id,))
+            user = cursor.fetchone()
+            user_id = user['id']
+            trade_id = trade_data.get('trade_id') or f"T{user['trade_number']}"
+            
             cursor.execute("""
                 INSERT INTO trades (
                     trade_id, user_id, account_id, pair, direction,
@@ -44,26 +178,29 @@ def save_trade(trade_data: Dict, telegram_id: int) -> bool:
                     session, news_risk, notes, entry_datetime, exit_datetime
                 ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """, (
-                trade_data['trade_id'],
+                trade_id,
                 user_id,
-                trade_data.get('account_id', 'main'),
-                trade_data['pair'],
+                trade_row['account_id'],
+                trade_row['pair'],
                 trade_data['direction'],
                 trade_data['entry'],
                 trade_data.get('sl') or trade_data.get('stop_loss'),
                 trade_data.get('tp') or trade_data.get('take_profit'),
-                trade_data.get('status', 'OPEN'),
-                trade_data.get('result', ''),
-                trade_data.get('session', ''),
+                trade_row['status'],
+                trade_row['result'],
+                trade_row['session'],
                 trade_data.get('news_risk', ''),
                 trade_data.get('notes', ''),
                 trade_data.get('datetime') or trade_data.get('entry_datetime', datetime.now()),
                 trade_data.get('exit_datetime')
             ))
-        return True
+            # Keep the statistics rollup in the same transaction
+            _apply_stats_delta(cursor, user_id, trade_row, 1)
+        dashboard_cache.invalidate_user(telegram_id)
+        return trade_id
     except Exception as e:
         print(f"Error saving trade: {e}")
-        return False
+        return None
 
 
 def read_all_trades(telegram_id: int) -> List[Dict]:
@@ -107,6 +244,31 @@ def read_all_trades(telegram_id: int) -> List[Dict]:
         return []
 
 
+def read_trade_records(telegram_id: int) -> List[analytics.TradeRecord]:
+    """
+    Read compact trade records for analytics (no prices or notes).
+    
+    Args:
+        telegram_id: User's Telegram ID
+        
+    Returns:
+        List of TradeRecord tuples
+    """
+    try:
+        with get_db_connection() as cursor:
+            cursor.execute("""
+                SELECT t.trade_id, t.account_id, t.pair, t.session,
+                       t.status, t.result, t.exit_datetime
+                FROM trades t
+                JOIN users u ON u.id = t.user_id
+                WHERE u.telegram_id = %s
+            """, (telegram_id,))
+            return [analytics.record_from_row(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error reading trade records: {e}")
+        return []
+
+
 def get_trade_by_id(trade_id: str, telegram_id: int) -> Optional[Dict]:
     """
     Get a specific trade by ID.
@@ -194,13 +356,37 @@ def update_trade(trade_id: str, updates: Dict, telegram_id: int) -> bool:
         values.extend([trade_id, user_id])
         
         with get_db_connection() as cursor:
+            # Lock the row and capture its current stats bucket
+            cursor.execute("""
+                SELECT account_id, pair, session, status, result
+                FROM trades
+                WHERE trade_id = %s AND user_id = %s
+                FOR UPDATE
+            """, (trade_id, user_id))
+            before = cursor.fetchone()
+            if not before:
+                return False
+            
             query = f"""
                 UPDATE trades 
                 SET {', '.join(set_clauses)}
                 WHERE trade_id = %s AND user_id = %s
             """
             cursor.execute(query, values)
-            return cursor.rowcount > 0
+            if cursor.rowcount <= 0:
+                return False
+            
+            # Move the trade between rollup buckets if its status/result/session changed
+            after = dict(before)
+            for key in ('status', 'result', 'session'):
+                if key in updates:
+                    after[key] = updates[key]
+            if (_stats_bucket(before) != _stats_bucket(after)
+                    or (before['session'] or '') != (after['session'] or '')):
+                _apply_stats_delta(cursor, user_id, before, -1)
+                _apply_stats_delta(cursor, user_id, after, 1)
+            dashboard_cache.bump_version(cursor, telegram_id)
+        return True
     except Exception as e:
         print(f"Error updating trade: {e}")
         return False
@@ -282,41 +468,3 @@ def get_recent_trades(limit: int = 10, telegram_id: int = None) -> List[Dict]:
     except Exception as e:
         print(f"Error getting recent trades: {e}")
         return []
-
-
-def get_next_trade_id(telegram_id: int) -> str:
-    """
-    Get the next available trade ID for a user.
-    
-    Args:
-        telegram_id: User's Telegram ID
-    
-    Returns:
-        Next trade ID (format: T1, T2, T3, etc.)
-    """
-    try:
-        user_id = get_user_id_from_telegram(telegram_id)
-        if not user_id:
-            return "T1"
-        
-        with get_db_connection() as cursor:
-            cursor.execute("""
-                SELECT trade_id FROM trades
-                WHERE user_id = %s
-                ORDER BY id DESC
-                LIMIT 1
-            """, (user_id,))
-            
-            result = cursor.fetchone()
-            if not result:
-                return "T1"
-            
-            # Extract number from trade_id (e.g., "T5" -> 5)
-            last_id = result['trade_id']
-            if last_id.startswith('T'):
-                num = int(last_id[1:])
-                return f"T{num + 1}"
-            return "T1"
-    except Exception as e:
-        print(f"Error getting next trade ID: {e}")
-        return "T1"
@@ -0,0 +1,280 @@
+"""
+Subscriber registry - news alert subscriptions persisted in the database,
+mirrored in an in-memory index for per-event recipient selection
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from database import get_db_connection
+
+
+IMPACT_LEVELS = ('MEDIUM', 'HIGH')  # Lowest first
+
+
+def _parse_currencies(value: str) -> Set[str]:
+    return {c.strip().upper() for c in (value or '').split(',') if c.strip()}
+
+
+def is_muted(subscription: Dict, hour: int) -> bool:
+    """Whether hour (0-23, UK time) falls in the subscription's mute window."""
+    start, end = subscription.get('mute_start_hour'), subscription.get('mute_end_hour')
+    if start is None or end is None or start == end:
+        return False
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end  # Window wraps past midnight
+
+
+class SubscriberIndex:
+    """
+    Active subscriptions keyed for recipient lookup.
+
+    Subscribers with no currency filter are kept apart from the per-currency
+    buckets, so an event only touches the chats that can actually receive it.
+    """
+
+    def __init__(self):
+        self.by_chat: Dict[int, Dict] = {}
+        self.any_currency: Set[int] = set()
+        self.by_currency: Dict[str, Set[int]] = {}
+        self.high_only: Set[int] = set()
+
+    def add(self, subscription: Dict) -> None:
+        chat_id = subscription['chat_id']
+        self.remove(chat_id)
+        self.by_chat[chat_id] = subscription
+        currencies = subscription['currencies']
+        if not currencies:
+            self.any_currency.add(chat_id)
+        for currency in currencies:
+            self.by_currency.setdefault(currency, set()).add(chat_id)
+        if subscription['min_impact'] == 'HIGH':
+            self.high_only.add(chat_id)
+
+    def remove(self, chat_id: int) -> None:
+        subscription = self.by_chat.pop(chat_id, None)
+        if subscription is None:
+            return
+        self.any_currency.discard(chat_id)
+        self.high_only.discard(chat_id)
+        for currency in subscription['currencies']:
+            bucket = self.by_currency.get(currency)
+            if bucket is not None:
+                bucket.discard(chat_id)
+                if not bucket:
+                    del self.by_currency[currency]
+
+    def select(self, currency: Optional[str], impact: str, hour: int) -> List[int]:
+        if currency:
+            candidates = self.any_currency | self.by_currency.get(currency.upper(), set())
+        else:
+            # Unknown currency - can't rule anyone out
+            candidates = set(self.by_chat)
+        if impact != 'HIGH':
+            candidates -= self.high_only
+        return [chat_id for chat_id in candidates if not is_muted(self.by_chat[chat_id], hour)]
+
+
+_lock = threading.Lock()
+_index = SubscriberIndex()
+
+
+def _row_to_subscription(row: Dict) -> Dict:
+    return {
+        'chat_id': row['chat_id'],
+        'telegram_id': row['telegram_id'],
+        'currencies': _parse_currencies(row['currencies']),
+        'min_impact': row['min_impact'],
+        'mute_start_hour': row['mute_start_hour'],
+        'mute_end_hour': row['mute_end_hour']
+    }
+
+
+_SELECT_COLUMNS = """
+    SELECT chat_id, telegram_id, currencies, min_impact, mute_start_hour, mute_end_hour, active
+    FROM subscriptions
+"""
+
+
+def load_subscriptions() -> int:
+    """
+    (Re)build the in-memory index from the subscriptions table.
+    Call at startup, and before broadcasting when other replicas may have
+    changed subscriptions.
+
+    Returns:
+        Number of active subscriptions loaded
+    """
+    try:
+        with get_db_connection() as cursor:
+            cursor.execute(_SELECT_COLUMNS + " WHERE active = TRUE")
+            rows = cursor.fetchall()
+    except Exception as e:
+        print(f"❌ Error loading subscriptions: {e}")
+        return 0
+
+    index = SubscriberIndex()
+    for row in rows:
+        index.add(_row_to_subscription(row))
+
+    global _index
+    with _lock:
+        _index = index
+    return len(rows)
+
+
+def _refresh_chat(cursor, chat_id: int) -> None:
+    """Sync one chat's index entry with its (just written) database row."""
+    cursor.execute(_SELECT_COLUMNS + " WHERE chat_id = %s", (chat_id,))
+    row = cursor.fetchone()
+    with _lock:
+        if row and row['active']:
+            _index.add(_row_to_subscription(row))
+        else:
+            _index.remove(chat_id)
+
+
+def subscribe(chat_id: int, telegram_id: Optional[int] = None) -> bool:
+    """
+    Subscribe a chat to news alerts, keeping any existing preferences.
+
+    Args:
+        chat_id: Telegram chat ID
+        telegram_id: Owning user's Telegram ID
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with get_db_connection() as cursor:
+            cursor.execute("""
+                INSERT INTO subscriptions (chat_id, telegram_id, active)
+                VALUES (%s, %s, TRUE)
+                ON DUPLICATE KEY UPDATE
+                    telegram_id = COALESCE(VALUES(telegram_id), telegram_id),
+                    active = TRUE
+            """, (chat_id, telegram_id))
+            _refresh_chat(cursor, chat_id)
+        return True
+    except Exception as e:
+        print(f"❌ Error subscribing chat {chat_id}: {e}")
+        return False
+
+
+def unsubscribe(chat_id: int) -> bool:
+    """
+    Stop sending alerts to a chat (preferences are kept for re-subscription).
+
+    Args:
+        chat_id: Telegram chat ID
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with get_db_connection() as cursor:
+            cursor.execute("UPDATE subscriptions SET active = FALSE WHERE chat_id = %s", (chat_id,))
+        with _lock:
+            _index.remove(chat_id)
+        return True
+    except Exception as e:
+        print(f"❌ Error unsubscribing chat {chat_id}: {e}")
+        return False
+
+
+def update_preferences(chat_id: int, currencies: Optional[List[str]] = None,
+                       min_impact: Optional[str] = None,
+                       mute_hours: Optional[tuple] = None) -> bool:
+    """
+    Update a subscription's alert preferences. Arguments left as None are unchanged.
+
+    Args:
+        chat_id: Telegram chat ID
+        currencies: Currencies to alert on ([] for all)
+        min_impact: 'MEDIUM' or 'HIGH'
+        mute_hours: (start_hour, end_hour) in UK time, or (None, None) to unmute
+
+    Returns:
+        True if the subscription was updated, False otherwise
+    """
+    if min_impact is not None and min_impact not in IMPACT_LEVELS:
+        return False
+
+    assignments = []
+    params = []
+    if currencies is not None:
+        assignments.append("currencies = %s")
+        params.append(','.join(sorted({c.upper() for c in currencies})))
+    if min_impact is not None:
+        assignments.append("min_impact = %s")
+        params.append(min_impact)
+    if mute_hours is not None:
+        assignments.append("mute_start_hour = %s")
+        assignments.append("mute_end_hour = %s")
+        params.extend(mute_hours)
+    if not assignments:
+        return True
+
+    try:
+        with get_db_connection() as cursor:
+            cursor.execute(
+                f"UPDATE subscriptions SET {', '.join(assignments)} WHERE chat_id = %s",
+                params + [chat_id]
+            )
+            if cursor.rowcount == 0:
+                cursor.execute("SELECT 1 FROM subscriptions WHERE chat_id = %s", (chat_id,))
+                if not cursor.fetchone():
+                    return False
+            _refresh_chat(cursor, chat_id)
+        return True
+    except Exception as e:
+        print(f"❌ Error updating subscription {chat_id}: {e}")
+        return False
+
+
+def get_subscription(chat_id: int) -> Optional[Dict]:
+    """
+    Get a chat's active subscription from the index.
+
+    Returns:
+        Subscription dictionary, or None if the chat isn't subscribed
+    """
+    with _lock:
+        subscription = _index.by_chat.get(chat_id)
+        return dict(subscription) if subscription else None
+
+
+def select_recipients(currency: Optional[str], impact: str, at: datetime) -> List[int]:
+    """
+    Chats that want an alert for an event with this currency and impact.
+
+    Args:
+        currency: Event currency (e.g. 'USD'), or '' if unknown
+        impact: 'HIGH' or 'MEDIUM'
+        at: Delivery time (UK), used for mute windows
+
+    Returns:
+        List of chat IDs
+    """
+    with _lock:
+        return _index.select(currency, impact, at.hour)
+
+
+def all_recipients(at: datetime) -> List[int]:
+    """
+    Every active, currently unmuted subscriber (for general broadcasts).
+
+    Args:
+        at: Delivery time (UK), used for mute windows
+
+    Returns:
+        List of chat IDs
+    """
+    with _lock:
+        return [chat_id for chat_id, sub in _index.by_chat.items() if not is_muted(sub, at.hour)]
+
+
+def subscriber_count() -> int:
+    """Number of active subscriptions in the index."""
+    with _lock:
+        return len(_index.by_chat)
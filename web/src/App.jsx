@@ -17,6 +17,7 @@ function App() {
   const [error, setError] = useState(null)
   const [sidebarOpen, setSidebarOpen] = useState(false)
   const [selectedAccount, setSelectedAccount] = useState('all')
+  const [token, setToken] = useState(null)
 
   useEffect(() => {
     const fetchDashboard = async () => {
@@ -32,6 +33,7 @@ function App() {
         }
 
         const response = await axios.get(`/api/dashboard/${token}`)
+        setToken(token)
         setDashboardData(response.data)
         setLoading(false)
       } catch (err) {
@@ -213,7 +215,11 @@ function App() {
           </div>
           
           {/* Complete Trade History */}
-          <TradeHistory trades={filteredData.trades} />
+          <TradeHistory
+            trades={filteredData.trades}
+            token={token}
+            account={selectedAccount}
+          />
         </div>
       </div>
     </div>
@@ -1,12 +1,71 @@
-import { useState, useMemo } from 'react'
+import { useState, useMemo, useEffect, useRef } from 'react'
+import axios from 'axios'
 
-export default function TradeHistory({ trades }) {
+const PAGE_SIZE = 50
+
+export default function TradeHistory({ trades: initialTrades, token, account = 'all' }) {
   const [searchTerm, setSearchTerm] = useState('')
   const [filterStatus, setFilterStatus] = useState('all')
   const [filterResult, setFilterResult] = useState('all')
   const [sortField, setSortField] = useState('entry_datetime')
   const [sortDirection, setSortDirection] = useState('desc')
   const [expandedTrade, setExpandedTrade] = useState(null)
+  const [pagedTrades, setPagedTrades] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+
+  // Server-side filters for /api/trades (search stays client-side)
+  const buildParams = (cursor) => {
+    const params = { limit: PAGE_SIZE }
+    if (account !== 'all') params.account = account
+    if (filterStatus !== 'all') params.status = filterStatus
+    if (filterResult !== 'all') params.result = filterResult
+    if (cursor) params.cursor = cursor
+    return params
+  }
+
+  // Identifies the current result set; responses for an older one are dropped
+  const filterKey = [token, account, filterStatus, filterResult].join('|')
+  const filterKeyRef = useRef(filterKey)
+  filterKeyRef.current = filterKey
+
+  // Load the first page whenever the account or server-side filters change
+  useEffect(() => {
+    if (!token) return
+    let cancelled = false
+    // The old cursor belongs to the previous filters
+    setNextCursor(null)
+
+    axios.get(`/api/trades/${token}`, { params: buildParams(null) })
+      .then(response => {
+        if (cancelled) return
+        setPagedTrades(response.data.trades)
+        setNextCursor(response.data.next_cursor)
+      })
+      .catch(err => console.error('Trade history fetch error:', err))
+
+    return () => { cancelled = true }
+  }, [token, account, filterStatus, filterResult])
+
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return
+    setLoadingMore(true)
+    const requestKey = filterKey
+    try {
+      const response = await axios.get(`/api/trades/${token}`, { params: buildParams(nextCursor) })
+      // Account or filters changed while this page was loading
+      if (filterKeyRef.current !== requestKey) return
+      setPagedTrades(prev => [...(prev || []), ...response.data.trades])
+      setNextCursor(response.data.next_cursor)
+    } catch (err) {
+      console.error('Trade history fetch error:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  // Until the first page arrives, show the trades bundled with the dashboard
+  const trades = pagedTrades ?? initialTrades
 
   // Filter and sort trades
   const filteredTrades = useMemo(() => {
@@ -354,6 +413,18 @@ export default function TradeHistory({ trades }) {
         )}
       </div>
 
+      {nextCursor && (
+        <div className="text-center mt-6">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 bg-dark-700 border border-dark-600 rounded-lg text-primary-400 hover:text-primary-300 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load older trades'}
+          </button>
+        </div>
+      )}
+
       {filteredTrades.length === 0 && (
         <div className="text-center py-12 text-gray-400">
           <p>No trades match your filters</p>
@@ -2,324 +2,346 @@
 Web Dashboard API Server
 Provides REST API endpoints for the trading journal dashboard
 """
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import secrets
+import base64
 from datetime import datetime, timedelta
+from functools import wraps
+import hmac
+import mimetypes
 import os
-from database import get_db_connection
+from database import get_db_connection, get_pool_stats
 import config
+import dashboard_stats
+import dashboard_cache
+import dashboard_tokens
+import compression
+import json_serializer
+
+class APIJSONProvider(JSONProvider):
+    """jsonify()/app.json backed by json_serializer (orjson when installed)."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return json_serializer.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return json_serializer.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_serializer.dumps(obj), mimetype='application/json')
+
 
 app = Flask(__name__, static_folder='web/dist')
+app.json = APIJSONProvider(app)
 CORS(app)
 
-# Store active dashboard tokens (in production, use Redis or database)
-active_tokens = {}
-user_tokens = {}  # Maps telegram_id -> active token for reuse
+# Trade history page sizes for /api/trades
+TRADES_PAGE_DEFAULT = 50
+TRADES_PAGE_MAX = 200
+
+# Vite emits content-hashed filenames under assets/, so a URL's bytes never change
+HASHED_ASSETS_PREFIX = 'assets/'
+HASHED_ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_MAX_AGE_SECONDS = 3600  # Unhashed files (favicon etc.)
 
 
-def generate_dashboard_token(telegram_id: int, expires_hours: int = 24) -> str:
+def encode_page_cursor(trade: dict) -> str:
+    """Encode a trade row's (entry_datetime, row_id) keyset position as an opaque cursor."""
+    raw = f"{trade['entry_datetime'].isoformat()}|{trade['row_id']}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(value: str) -> tuple:
     """
-    Generate or reuse a secure token for dashboard access.
-    One token per user - reuses if still valid, generates new if expired.
+    Decode a cursor produced by encode_page_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        entry_str, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(entry_str), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_page_limit(args) -> int:
     """
-    # Check if user already has a valid token
-    if telegram_id in user_tokens:
-        existing_token = user_tokens[telegram_id]
-        if existing_token in active_tokens:
-            token_data = active_tokens[existing_token]
-            # If token still valid for at least 1 hour, reuse it
-            if datetime.now() + timedelta(hours=1) < token_data['expires']:
-                print(f"♻️ Reusing existing token for user {telegram_id}")
-                return existing_token
-            else:
-                # Token expiring soon, clean it up
-                print(f"🧹 Cleaning up expiring token for user {telegram_id}")
-                del active_tokens[existing_token]
-                del user_tokens[telegram_id]
+    Validate the /api/trades page size, clamped to 1..TRADES_PAGE_MAX.
     
-    # Generate new token
-    token = secrets.token_urlsafe(32)
-    expiry = datetime.now() + timedelta(hours=expires_hours)
-    active_tokens[token] = {
-        'telegram_id': telegram_id,
-        'expires': expiry
-    }
-    user_tokens[telegram_id] = token
-    print(f"🔑 Generated new token for user {telegram_id}")
-    return token
+    Raises:
+        ValueError: If limit isn't an integer
+    """
+    try:
+        limit = int(args.get('limit', TRADES_PAGE_DEFAULT))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    return min(max(limit, 1), TRADES_PAGE_MAX)
 
 
-def verify_token(token: str) -> int:
-    """Verify token and return telegram_id, or None if invalid."""
-    if token not in active_tokens:
-        return None
+def parse_trade_filters(args) -> dict:
+    """
+    Validate /api/trades query-string filters.
     
-    token_data = active_tokens[token]
-    if datetime.now() > token_data['expires']:
-        # Token expired - clean up
-        telegram_id = token_data['telegram_id']
-        del active_tokens[token]
-        if telegram_id in user_tokens and user_tokens[telegram_id] == token:
-            del user_tokens[telegram_id]
-        print(f"🧹 Cleaned up expired token for user {telegram_id}")
-        return None
+    Raises:
+        ValueError: If a filter value is invalid
+    """
+    filters = {
+        'account_id': args.get('account') or None,
+        'pair': args.get('pair', '').upper() or None,
+        'session': args.get('session') or None,
+        'status': args.get('status', '').upper() or None,
+        'result': args.get('result', '').upper() or None
+    }
+    if filters['status'] not in (None, 'OPEN', 'CLOSED'):
+        raise ValueError("status must be OPEN or CLOSED")
+    if filters['result'] not in (None, 'W', 'L', 'BE'):
+        raise ValueError("result must be W, L or BE")
+    
+    # Dates are YYYY-MM-DD; 'to' is inclusive of the whole day
+    try:
+        if args.get('from'):
+            filters['date_from'] = datetime.strptime(args['from'], '%Y-%m-%d')
+        if args.get('to'):
+            filters['date_to'] = datetime.strptime(args['to'], '%Y-%m-%d') + timedelta(days=1)
+    except ValueError:
+        raise ValueError("from/to must be YYYY-MM-DD dates")
+    return filters
+
+
+def build_dashboard_payload(telegram_id: int) -> dict:
+    """
+    Build the complete dashboard payload for a user from the database.
     
-    return token_data['telegram_id']
+    Returns:
+        Dashboard dictionary, or None if the user doesn't exist
+    """
+    with get_db_connection() as cursor:
+        # Get user info
+        cursor.execute("""
+            SELECT id, telegram_id, username, first_name, email
+            FROM users WHERE telegram_id = %s
+        """, (telegram_id,))
+        user = cursor.fetchone()
+        
+        if not user:
+            return None
+        
+        user_id = user['id']
+        
+        # Get accounts
+        cursor.execute("""
+            SELECT account_id, account_name, is_default
+            FROM accounts WHERE user_id = %s
+        """, (user_id,))
+        accounts = cursor.fetchall()
+        
+        # Calculate user initials
+        name = user['first_name'] or user['username'] or 'User'
+        name_parts = name.split()
+        initials = ''.join([part[0].upper() for part in name_parts if part])[:2]
+        if len(initials) < 2 and len(name) > 0:
+            initials = name[0:2].upper()
+        
+        # Aggregate statistics come from the user_stats rollup;
+        # only the recent trades list pulls individual rows
+        dashboard_stats_data = dashboard_stats.get_dashboard_stats(cursor, user_id, accounts)
+        # Rows are already in API shape (last 100 trades)
+        trades = dashboard_stats.fetch_recent_trades(cursor, user_id, limit=100)
+        
+        return {
+            'user': {
+                'telegram_id': user['telegram_id'],
+                'username': user['username'],
+                'name': user['first_name'],
+                'email': user['email'],
+                'initials': initials
+            },
+            'stats': dashboard_stats_data['stats'],
+            'equity_curve': dashboard_stats_data['equity_curve'],
+            'pair_stats': dashboard_stats_data['pair_stats'],
+            'session_stats': dashboard_stats_data['session_stats'],
+            'account_stats': dashboard_stats_data['account_stats'],
+            'accounts': [{'account_id': a['account_id'], 'account_name': a['account_name'], 'is_default': a['is_default']} for a in accounts],
+            'recent_trades': trades
+        }
 
 
-def cleanup_expired_tokens():
-    """Remove all expired tokens from memory."""
-    now = datetime.now()
-    expired_tokens = [
-        token for token, data in active_tokens.items()
-        if now > data['expires']
-    ]
+def get_encoded_body(entry: dict, encoding: str) -> bytes:
+    """
+    Cached dashboard body in the requested encoding.
+    Compressed once per cache entry, not once per request.
+    """
+    if not encoding:
+        return entry['body']
+    encoded = entry.setdefault('encoded', {})
+    if encoding not in encoded:
+        encoded[encoding] = compression.compress(entry['body'], encoding)
+    return encoded[encoding]
+
+
+@app.after_request
+def compress_json_response(response):
+    """gzip/brotli-encode JSON API responses when the client accepts it."""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype != 'application/json'):
+        return response
     
-    for token in expired_tokens:
-        telegram_id = active_tokens[token]['telegram_id']
-        del active_tokens[token]
-        if telegram_id in user_tokens and user_tokens[telegram_id] == token:
-            del user_tokens[telegram_id]
+    body = response.get_data()
+    if len(body) < compression.MIN_COMPRESS_BYTES:
+        return response
     
-    if expired_tokens:
-        print(f"🧹 Cleaned up {len(expired_tokens)} expired tokens")
-    return len(expired_tokens)
+    response.vary.add('Accept-Encoding')
+    encoding = compression.choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding:
+        response.set_data(compression.compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 
 @app.route('/api/dashboard/<token>')
 def get_dashboard_data(token):
-    """Get complete dashboard data for a user."""
-    telegram_id = verify_token(token)
+    """Get complete dashboard data for a user (served from cache when unchanged)."""
+    telegram_id = dashboard_tokens.verify_token(token)
     if not telegram_id:
         return jsonify({'error': 'Invalid or expired token'}), 401
     
     try:
+        # Read before building, so a concurrent write can only make the entry look older
         with get_db_connection() as cursor:
-            # Get user info
-            cursor.execute("""
-                SELECT id, telegram_id, username, first_name, email
-                FROM users WHERE telegram_id = %s
-            """, (telegram_id,))
+            version = dashboard_cache.fetch_version(cursor, telegram_id)
+        if version is None:
+            return jsonify({'error': 'User not found'}), 404
+        
+        entry = dashboard_cache.get(telegram_id, version)
+        if entry is None:
+            payload = build_dashboard_payload(telegram_id)
+            if payload is None:
+                return jsonify({'error': 'User not found'}), 404
+            entry = dashboard_cache.put(telegram_id, version, json_serializer.dumps(payload))
+        
+        encoding = None
+        if len(entry['body']) >= compression.MIN_COMPRESS_BYTES:
+            encoding = compression.choose_encoding(request.headers.get('Accept-Encoding', ''))
+        # Each encoding is a different representation, so it gets its own ETag
+        etag = f"{entry['etag']}-{encoding}" if encoding else entry['etag']
+        
+        if request.if_none_match.contains(etag):
+            dashboard_cache.record_not_modified()
+            response = Response(status=304)
+        else:
+            response = Response(get_encoded_body(entry, encoding), mimetype='application/json')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        # Browser may store the payload but must revalidate it on every load
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+        
+    except Exception as e:
+        print(f"❌ Dashboard API error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/trades/<token>')
+def get_trades_page(token):
+    """
+    Paginated, filterable trade history.
+    
+    Query params: limit, cursor, account, pair, session, status, result,
+    from (YYYY-MM-DD), to (YYYY-MM-DD)
+    """
+    telegram_id = dashboard_tokens.verify_token(token)
+    if not telegram_id:
+        return jsonify({'error': 'Invalid or expired token'}), 401
+    
+    try:
+        limit = parse_page_limit(request.args)
+        filters = parse_trade_filters(request.args)
+        after = decode_page_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        with get_db_connection() as cursor:
+            cursor.execute("SELECT id FROM users WHERE telegram_id = %s", (telegram_id,))
             user = cursor.fetchone()
-            
             if not user:
                 return jsonify({'error': 'User not found'}), 404
             
-            user_id = user['id']
-            
-            # Get all trades
-            cursor.execute("""
-                SELECT * FROM trades 
-                WHERE user_id = %s 
-                ORDER BY entry_datetime DESC
-            """, (user_id,))
-            trades = cursor.fetchall()
-            
-            # Calculate statistics
-            total_trades = len(trades)
-            closed_trades = [t for t in trades if t['status'] == 'CLOSED']
-            open_trades = [t for t in trades if t['status'] == 'OPEN']
-            
-            wins = len([t for t in closed_trades if t['result'] == 'W'])
-            losses = len([t for t in closed_trades if t['result'] == 'L'])
-            break_even = len([t for t in closed_trades if t['result'] == 'BE'])
-            
-            win_rate = (wins / len(closed_trades) * 100) if closed_trades else 0
-            
-            # Group by pair
-            pair_stats = {}
-            for trade in trades:
-                pair = trade['pair']
-                if pair not in pair_stats:
-                    pair_stats[pair] = {
-                        'total': 0,
-                        'wins': 0,
-                        'losses': 0,
-                        'win_rate': 0
-                    }
-                pair_stats[pair]['total'] += 1
-                if trade['result'] == 'W':
-                    pair_stats[pair]['wins'] += 1
-                elif trade['result'] == 'L':
-                    pair_stats[pair]['losses'] += 1
-            
-            # Calculate win rates
-            for pair in pair_stats:
-                closed = pair_stats[pair]['wins'] + pair_stats[pair]['losses']
-                if closed > 0:
-                    pair_stats[pair]['win_rate'] = (pair_stats[pair]['wins'] / closed * 100)
-            
-            # Group by session
-            session_stats = {}
-            for trade in trades:
-                session = trade['session'] or 'Unknown'
-                if session not in session_stats:
-                    session_stats[session] = {
-                        'total': 0,
-                        'wins': 0,
-                        'losses': 0,
-                        'win_rate': 0
-                    }
-                session_stats[session]['total'] += 1
-                if trade['result'] == 'W':
-                    session_stats[session]['wins'] += 1
-                elif trade['result'] == 'L':
-                    session_stats[session]['losses'] += 1
-            
-            # Calculate session win rates
-            for session in session_stats:
-                closed = session_stats[session]['wins'] + session_stats[session]['losses']
-                if closed > 0:
-                    session_stats[session]['win_rate'] = (session_stats[session]['wins'] / closed * 100)
-            
-            # Get accounts
-            cursor.execute("""
-                SELECT account_id, account_name, is_default
-                FROM accounts WHERE user_id = %s
-            """, (user_id,))
-            accounts = cursor.fetchall()
-            
-            # Calculate user initials
-            name = user['first_name'] or user['username'] or 'User'
-            name_parts = name.split()
-            initials = ''.join([part[0].upper() for part in name_parts if part])[:2]
-            if len(initials) < 2 and len(name) > 0:
-                initials = name[0:2].upper()
-            
-            # Calculate comprehensive trading metrics
-            # Sort closed trades by exit date for time-series
-            closed_trades_sorted = sorted(
-                [t for t in closed_trades if t['exit_datetime']], 
-                key=lambda x: x['exit_datetime']
-            )
-            
-            # Build equity curve (cumulative P&L)
-            equity_curve = []
-            cumulative_pnl = 0
-            for trade in closed_trades_sorted:
-                # Calculate P&L (simplified - using pips or percentage)
-                pnl = 0
-                if trade['result'] == 'W':
-                    pnl = 1  # Win
-                elif trade['result'] == 'L':
-                    pnl = -1  # Loss
-                # For break-even, pnl stays 0
-                
-                cumulative_pnl += pnl
-                equity_curve.append({
-                    'date': trade['exit_datetime'].strftime('%Y-%m-%d'),
-                    'timestamp': trade['exit_datetime'].isoformat(),
-                    'pnl': pnl,
-                    'cumulative': cumulative_pnl,
-                    'trade_id': trade['trade_id']
-                })
-            
-            # Calculate win/loss streaks
-            current_streak = 0
-            current_streak_type = None
-            max_win_streak = 0
-            max_loss_streak = 0
-            
-            for trade in closed_trades_sorted:
-                if trade['result'] == 'W':
-                    if current_streak_type == 'W':
-                        current_streak += 1
-                    else:
-                        current_streak = 1
-                        current_streak_type = 'W'
-                    max_win_streak = max(max_win_streak, current_streak)
-                elif trade['result'] == 'L':
-                    if current_streak_type == 'L':
-                        current_streak += 1
-                    else:
-                        current_streak = 1
-                        current_streak_type = 'L'
-                    max_loss_streak = max(max_loss_streak, current_streak)
-                else:  # Break-even resets streak
-                    current_streak = 0
-                    current_streak_type = None
-            
-            # Calculate profit factor and expectancy
-            total_wins = wins
-            total_losses = losses
-            avg_win = total_wins / wins if wins > 0 else 0
-            avg_loss = total_losses / losses if losses > 0 else 0
-            profit_factor = (total_wins / total_losses) if total_losses > 0 else float('inf')
-            expectancy = (avg_win * win_rate / 100) - (avg_loss * (100 - win_rate) / 100) if closed_trades else 0
-            
-            # Calculate per-account statistics
-            account_stats = {}
-            for account in accounts:
-                acc_id = account['account_id']
-                acc_trades = [t for t in trades if t['account_id'] == acc_id]
-                acc_closed = [t for t in acc_trades if t['status'] == 'CLOSED']
-                acc_wins = len([t for t in acc_closed if t['result'] == 'W'])
-                acc_losses = len([t for t in acc_closed if t['result'] == 'L'])
-                acc_be = len([t for t in acc_closed if t['result'] == 'BE'])
-                
-                account_stats[acc_id] = {
-                    'account_name': account['account_name'],
-                    'is_default': account['is_default'],
-                    'total_trades': len(acc_trades),
-                    'closed_trades': len(acc_closed),
-                    'open_trades': len([t for t in acc_trades if t['status'] == 'OPEN']),
-                    'wins': acc_wins,
-                    'losses': acc_losses,
-                    'break_even': acc_be,
-                    'win_rate': (acc_wins / len(acc_closed) * 100) if acc_closed else 0
-                }
-            
-            # Format trades for response
-            formatted_trades = []
-            for trade in trades[:100]:  # Last 100 trades
-                formatted_trades.append({
-                    'id': trade['trade_id'],
-                    'pair': trade['pair'],
-                    'direction': trade['direction'],
-                    'entry_price': float(trade['entry_price']),
-                    'stop_loss': float(trade['stop_loss']) if trade['stop_loss'] else None,
-                    'take_profit': float(trade['take_profit']) if trade['take_profit'] else None,
-                    'status': trade['status'],
-                    'result': trade['result'],
-                    'session': trade['session'],
-                    'news_risk': trade['news_risk'],
-                    'entry_datetime': trade['entry_datetime'].isoformat() if trade['entry_datetime'] else None,
-                    'exit_datetime': trade['exit_datetime'].isoformat() if trade['exit_datetime'] else None,
-                    'account': trade['account_id']
-                })
-            
-            return jsonify({
-                'user': {
-                    'telegram_id': user['telegram_id'],
-                    'username': user['username'],
-                    'name': user['first_name'],
-                    'email': user['email'],
-                    'initials': initials
-                },
-                'stats': {
-                    'total_trades': total_trades,
-                    'open_trades': len(open_trades),
-                    'closed_trades': len(closed_trades),
-                    'wins': wins,
-                    'losses': losses,
-                    'break_even': break_even,
-                    'win_rate': round(win_rate, 2),
-                    'max_win_streak': max_win_streak,
-                    'max_loss_streak': max_loss_streak,
-                    'profit_factor': round(profit_factor, 2) if profit_factor != float('inf') else 'N/A',
-                    'expectancy': round(expectancy, 2)
-                },
-                'equity_curve': equity_curve,
-                'pair_stats': pair_stats,
-                'session_stats': session_stats,
-                'account_stats': account_stats,
-                'accounts': [{'account_id': a['account_id'], 'account_name': a['account_name'], 'is_default': a['is_default']} for a in accounts],
-                'recent_trades': formatted_trades
-            })
-            
+            rows = dashboard_stats.fetch_trades_page(cursor, user['id'], filters, after=after, limit=limit)
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_page_cursor(rows[-1]) if has_more else None
+        for row in rows:
+            del row['row_id']  # Internal keyset position, not part of the API
+        
+        return jsonify({
+            'trades': rows,
+            'next_cursor': next_cursor
+        })
     except Exception as e:
-        print(f"❌ Dashboard API error: {e}")
+        print(f"❌ Trades API error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/healthz')
+def liveness():
+    """Liveness probe: this worker is up and serving requests (no dependencies checked)."""
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/readyz')
+def readiness():
+    """Readiness probe: a pooled DB connection answers within HEALTH_DB_TIMEOUT_SECONDS."""
+    try:
+        with get_db_connection(timeout=config.HEALTH_DB_TIMEOUT_SECONDS) as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+    except Exception as e:
+        print(f"❌ Readiness check failed: {e}")
+        return jsonify({'status': 'unavailable', 'error': type(e).__name__, 'pool': get_pool_stats()}), 503
+    return jsonify({'status': 'ready', 'pool': get_pool_stats()})
+
+
+def require_admin_secret(view):
+    """Only serve the view to requests carrying X-Admin-Secret: ADMIN_API_SECRET."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not config.ADMIN_API_SECRET:
+            return jsonify({'error': 'Not found'}), 404
+        secret = request.headers.get('X-Admin-Secret', '')
+        if not hmac.compare_digest(secret.encode('utf-8'), config.ADMIN_API_SECRET.encode('utf-8')):
+            return jsonify({'error': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@app.route('/api/cache-stats')
+@require_admin_secret
+def get_cache_stats():
+    """Dashboard cache hit/miss counters."""
+    return jsonify(dashboard_cache.get_cache_stats())
+
+
+@app.route('/api/token-stats')
+@require_admin_secret
+def get_token_stats():
+    """Dashboard token gauges: live tokens and expiry sweep durations."""
+    try:
+        return jsonify(dashboard_tokens.get_token_stats())
+    except Exception as e:
+        print(f"❌ Token stats error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -334,8 +356,34 @@ def serve_react(path):
         }), 503
 
     if path and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    return send_from_directory(app.static_folder, 'index.html')
+        return send_static_file(path)
+    return send_static_file('index.html')
+
+
+def send_static_file(path: str):
+    """
+    Send a built dashboard file, preferring a precompressed .br/.gz variant
+    the client accepts (written at build time by compression.py).
+    """
+    served, encoding = compression.find_precompressed(
+        app.static_folder, path, request.headers.get('Accept-Encoding', '')
+    )
+    response = send_from_directory(
+        app.static_folder,
+        served,
+        mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream',
+        max_age=STATIC_MAX_AGE_SECONDS
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    
+    if path.startswith(HASHED_ASSETS_PREFIX):
+        response.headers['Cache-Control'] = HASHED_ASSET_CACHE_CONTROL
+    elif path == 'index.html':
+        # Always revalidate, so a deploy's new asset hashes are picked up immediately
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 
 if __name__ == '__main__':
@@ -0,0 +1,144 @@
+"""
+Webhook server - Telegram updates and the dashboard API served together by
+one ASGI server (uvicorn) on PORT, instead of long polling plus Flask's dev server
+"""
+import hmac
+import json
+import logging
+import os
+import re
+from a2wsgi import WSGIMiddleware
+import uvicorn
+from telegram import Update
+from telegram.ext import Application
+import config
+import bot
+from web_server import app as dashboard_app
+
+logger = logging.getLogger(__name__)
+
+SECRET_TOKEN_HEADER = b'x-telegram-bot-api-secret-token'
+SECRET_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,256}$')  # What Telegram accepts
+
+
+class RequestTooLarge(Exception):
+    """Request body exceeded WEBHOOK_MAX_BODY_BYTES."""
+
+
+async def _read_body(receive, limit: int) -> bytes:
+    """Read an ASGI request body, refusing anything over limit bytes."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return b''
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > limit:
+            raise RequestTooLarge()
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def _respond(send, status: int) -> None:
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'text/plain'), (b'content-length', b'0')]
+    })
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+class WebhookApp:
+    """
+    ASGI app: requests to WEBHOOK_PATH feed the bot's update queue on the
+    event loop; everything else goes to the Flask dashboard, which runs on
+    a pool of WEB_THREADS threads so dashboard requests are served
+    concurrently and never block the bot.
+    """
+
+    def __init__(self, application: Application, wsgi_app):
+        self.application = application
+        # Not asgiref's WsgiToAsgi: its thread-sensitive executor serializes every request
+        self.dashboard = WSGIMiddleware(wsgi_app, workers=config.WEB_THREADS)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == config.WEBHOOK_PATH:
+            await self.handle_update(scope, receive, send)
+        else:
+            await self.dashboard(scope, receive, send)
+
+    async def handle_update(self, scope, receive, send) -> None:
+        if scope['method'] != 'POST':
+            await _respond(send, 405)
+            return
+
+        # Only Telegram knows the secret (sent with setWebhook); compare in constant time
+        token = dict(scope['headers']).get(SECRET_TOKEN_HEADER, b'')
+        if not hmac.compare_digest(token, config.WEBHOOK_SECRET_TOKEN.encode('utf-8')):
+            await _respond(send, 403)
+            return
+
+        try:
+            body = await _read_body(receive, config.WEBHOOK_MAX_BODY_BYTES)
+            update = Update.de_json(json.loads(body), self.application.bot)
+        except RequestTooLarge:
+            await _respond(send, 413)
+            return
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"⚠️ Rejected malformed webhook update: {e}")
+            await _respond(send, 400)
+            return
+
+        # Acknowledge immediately; handlers run from the queue like in polling mode
+        await self.application.update_queue.put(update)
+        await _respond(send, 200)
+
+
+def check_webhook_config() -> None:
+    """
+    Raises:
+        RuntimeError: If a setting required for webhook mode is missing or invalid
+    """
+    if not config.TELEGRAM_BOT_TOKEN:
+        raise RuntimeError("TELEGRAM_BOT_TOKEN not found! Please set it in .env file")
+    if not config.WEBHOOK_URL.startswith('https://'):
+        raise RuntimeError("WEBHOOK_URL must be the public https:// base URL of this service")
+    if not config.WEBHOOK_PATH.startswith('/'):
+        raise RuntimeError("WEBHOOK_PATH must start with '/'")
+    if not SECRET_TOKEN_PATTERN.match(config.WEBHOOK_SECRET_TOKEN):
+        raise RuntimeError("WEBHOOK_SECRET_TOKEN must be 1-256 characters of A-Z, a-z, 0-9, _ and -")
+
+
+async def serve() -> None:
+    """Register the webhook with Telegram and serve until SIGINT/SIGTERM."""
+    check_webhook_config()
+    application = bot.build_application(polling=False)
+    port = int(os.getenv('PORT', 8080))
+    server = uvicorn.Server(uvicorn.Config(
+        WebhookApp(application, dashboard_app),
+        host='0.0.0.0',
+        port=port,
+        lifespan='off',  # Bot startup/shutdown is handled here, around server.serve()
+        log_level='info'
+    ))
+
+    async with application:
+        # run_polling() calls these hooks itself; a manual lifecycle has to as well
+        await application.post_init(application)
+        # Idempotent, so re-registering on every restart is harmless
+        await application.bot.set_webhook(
+            url=config.WEBHOOK_URL + config.WEBHOOK_PATH,
+            allowed_updates=Update.ALL_TYPES,
+            secret_token=config.WEBHOOK_SECRET_TOKEN,
+            max_connections=config.BOT_CONCURRENT_UPDATES
+        )
+        await application.start()
+        logger.info(f"🚀 Webhook server listening on port {port} ({config.WEBHOOK_PATH})")
+        try:
+            await server.serve()
+        finally:
+            await application.stop()
+            await application.post_shutdown(application)